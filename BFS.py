@@ -1,46 +1,30 @@
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
-from collections import deque
+from aisearch.uninformed import bfs
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph object as session state so it persists across interactions
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Function to add node
 def add_node(node):
     st.session_state.graph.add_node(node)
+    st.session_state.graph_version += 1
 
 # Function to add edge between two nodes
 def add_edge(node1, node2):
     st.session_state.graph.add_edge(node1, node2)
-
-# BFS algorithm to search the graph
-def bfs(graph, start, goal):
-    visited = set()
-    queue = deque([[start]])  # Store paths instead of just nodes
-
-    if start == goal:
-        return [start]
-
-    while queue:
-        path = queue.popleft()
-        node = path[-1]
-
-        if node not in visited:
-            neighbors = graph[node]
-
-            for neighbor in neighbors:
-                new_path = list(path)
-                new_path.append(neighbor)
-                queue.append(new_path)
-
-                if neighbor == goal:
-                    return new_path
-
-            visited.add(node)
-
-    return None  # If no path found
+    st.session_state.graph_version += 1
 
 # Streamlit UI
 st.title("BFS Graph Search Visualization")
@@ -61,6 +45,17 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2)
 
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name)
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph)
+
 # Select source and destination for BFS
 st.subheader("BFS Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
@@ -70,6 +65,7 @@ goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes
 if st.button("Start BFS Search"):
     if start_node and goal_node:
         path = bfs(st.session_state.graph, start_node, goal_node)
+        st.session_state.highlight = path
         if path:
             st.write(f"Path found: {' -> '.join(path)}")
         else:
@@ -80,8 +76,9 @@ st.subheader("Graph Visualization")
 
 # Draw the graph
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)  # Layout for visualization
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue')
+    st.image(image)
 
+draw_graph()
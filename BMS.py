@@ -1,80 +1,30 @@
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
-from collections import deque
+from aisearch.uninformed import bidirectional_dijkstra, bidirectional_search
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph object in session state so it persists across interactions
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Function to add node
 def add_node(node):
     st.session_state.graph.add_node(node)
+    st.session_state.graph_version += 1
 
-# Function to add edge between two nodes
-def add_edge(node1, node2):
-    st.session_state.graph.add_edge(node1, node2)
-
-# Function for Bidirectional Search (BDS)
-def bidirectional_search(graph, start, goal):
-    if start == goal:
-        return [start]
-
-    # Frontiers for BFS from both directions
-    start_queue = deque([start])
-    goal_queue = deque([goal])
-
-    # Parents to reconstruct path
-    start_parents = {start: None}
-    goal_parents = {goal: None}
-
-    while start_queue and goal_queue:
-        # Expand from start side
-        if start_queue:
-            path = expand(graph, start_queue, start_parents, goal_parents)
-            if path:
-                return path
-
-        # Expand from goal side
-        if goal_queue:
-            path = expand(graph, goal_queue, goal_parents, start_parents)
-            if path:
-                return path
-
-    return None  # If no path found
-
-# Helper function for expanding the search frontier
-def expand(graph, queue, parents, other_parents):
-    current = queue.popleft()
-
-    for neighbor in graph.neighbors(current):
-        if neighbor not in parents:
-            parents[neighbor] = current
-            queue.append(neighbor)
-
-            if neighbor in other_parents:  # Path found
-                return construct_path(parents, other_parents, neighbor)
-    
-    return None
-
-# Helper function to construct the full path from both sides
-def construct_path(start_parents, goal_parents, meeting_node):
-    # Path from start to meeting node
-    path_start = []
-    node = meeting_node
-    while node:
-        path_start.append(node)
-        node = start_parents[node]
-    path_start.reverse()
-
-    # Path from meeting node to goal
-    path_goal = []
-    node = goal_parents[meeting_node]
-    while node:
-        path_goal.append(node)
-        node = goal_parents[node]
-
-    return path_start + path_goal
+# Function to add edge between two nodes (weights are used by the weighted mode)
+def add_edge(node1, node2, weight):
+    st.session_state.graph.add_edge(node1, node2, weight=weight)
+    st.session_state.graph_version += 1
 
 # Streamlit UI
 st.title("Bidirectional Search (BDS) Graph Visualization")
@@ -91,32 +41,56 @@ if st.button("Add Node"):
 # Add edge between two nodes
 node1 = st.text_input("Node 1:")
 node2 = st.text_input("Node 2:")
+weight = st.number_input(f"Enter weight for the edge between {node1} and {node2}:", min_value=1.0, max_value=100.0, value=1.0)
 if st.button("Add Edge"):
     if node1 and node2:
-        add_edge(node1, node2)
+        add_edge(node1, node2, weight)
+
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name)
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph)
 
 # Select source and destination for BDS
 st.subheader("BDS Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
 goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes)
+weighted = st.checkbox("Use edge weights (bidirectional Dijkstra)")
+balance_options = {"Alternate one node per side": None, "Whole level, smaller frontier": 'size', "Whole level, smaller total degree": 'degree'}
+balance = balance_options[st.selectbox("Frontier expansion", list(balance_options))]
 
 # Button to start BDS search
 if st.button("Start BDS Search"):
     if start_node and goal_node:
-        path = bidirectional_search(st.session_state.graph, start_node, goal_node)
-        if path:
+        if weighted:
+            path, cost = bidirectional_dijkstra(st.session_state.graph, start_node, goal_node)
+        else:
+            stats = {}
+            path = bidirectional_search(st.session_state.graph, start_node, goal_node, balance=balance, stats=stats)
+        st.session_state.highlight = path
+        if path and weighted:
+            st.write(f"Shortest path found: {' -> '.join(path)} with cost: {cost}")
+        elif path:
             st.write(f"Path found: {' -> '.join(path)}")
         else:
             st.write("No path found!")
+        if not weighted:
+            st.write(f"Nodes expanded: {stats['forward_explored']} from start, {stats['backward_explored']} from goal")
 
 # Visualize graph
 st.subheader("Graph Visualization")
 
 # Draw the graph
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)  # Layout for visualization
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue')
+    st.image(image)
 
 draw_graph()
@@ -1,12 +1,21 @@
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
-import random
+from aisearch.informed import beam_search
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Initialize heuristic values (for Beam Search) in session state
 if 'heuristics' not in st.session_state:
     st.session_state.heuristics = {}
@@ -15,38 +24,12 @@ if 'heuristics' not in st.session_state:
 def add_node(node, heuristic_value):
     st.session_state.graph.add_node(node)
     st.session_state.heuristics[node] = heuristic_value
+    st.session_state.graph_version += 1
 
 # Function to add edge between two nodes
 def add_edge(node1, node2):
     st.session_state.graph.add_edge(node1, node2)
-
-# Beam Search algorithm
-def beam_search(graph, start, goal, beam_width):
-    current_nodes = [(start, [start])]  # List of tuples (node, path)
-    
-    while current_nodes:
-        next_nodes = []
-
-        # Expand each node in the current beam
-        for node, path in current_nodes:
-            if node == goal:
-                return path  # Path found
-
-            neighbors = list(graph.neighbors(node))
-            for neighbor in neighbors:
-                if neighbor not in path:  # Prevent cycles
-                    new_path = path + [neighbor]
-                    next_nodes.append((neighbor, new_path))
-
-        # Sort by heuristic value and keep only the top beam_width nodes
-        next_nodes = sorted(next_nodes, key=lambda x: st.session_state.heuristics[x[0]])[:beam_width]
-
-        if not next_nodes:
-            break  # No more nodes to explore
-
-        current_nodes = next_nodes
-
-    return None  # No path found
+    st.session_state.graph_version += 1
 
 # Streamlit UI
 st.title("Beam Search Visualization")
@@ -68,6 +51,17 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2)
 
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name, {'heuristic': 'heuristics'})
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph, {'heuristic': 'heuristics'})
+
 # Select source, destination, and beam width for Beam Search
 st.subheader("Beam Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
@@ -77,7 +71,8 @@ beam_width = st.slider("Select Beam Width", min_value=1, max_value=10, value=2)
 # Button to start Beam Search
 if st.button("Start Beam Search"):
     if start_node and goal_node:
-        path = beam_search(st.session_state.graph, start_node, goal_node, beam_width)
+        path = beam_search(st.session_state.graph, start_node, goal_node, st.session_state.heuristics, beam_width)
+        st.session_state.highlight = path
         if path:
             st.write(f"Path found: {' -> '.join(path)}")
         else:
@@ -87,14 +82,10 @@ if st.button("Start Beam Search"):
 st.subheader("Graph Visualization")
 
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-
-    # Add heuristic values as node labels
-    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in st.session_state.graph.nodes}
-    nx.draw_networkx_labels(st.session_state.graph, pos, labels, font_size=12)
-    
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in graph.nodes}
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue', labels=labels)
+    st.image(image)
 
 draw_graph()
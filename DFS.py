@@ -1,37 +1,30 @@
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
+from aisearch.uninformed import dfs
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Function to add node
 def add_node(node):
     st.session_state.graph.add_node(node)
+    st.session_state.graph_version += 1
 
 # Function to add edge
 def add_edge(node1, node2):
     st.session_state.graph.add_edge(node1, node2)
-
-# DFS algorithm
-def dfs(graph, start, goal, path=None, visited=None):
-    if path is None:
-        path = [start]
-    if visited is None:
-        visited = set()
-    
-    visited.add(start)
-    
-    if start == goal:
-        return path
-    
-    for neighbor in graph.neighbors(start):
-        if neighbor not in visited:
-            result = dfs(graph, neighbor, goal, path + [neighbor], visited)
-            if result:
-                return result
-    return None
+    st.session_state.graph_version += 1
 
 # Streamlit UI
 st.title("Depth-First Search (DFS) Graph Visualization")
@@ -49,6 +42,17 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2)
 
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name)
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph)
+
 # Select source and destination
 st.subheader("DFS Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
@@ -58,6 +62,7 @@ goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes
 if st.button("Start DFS Search"):
     if start_node and goal_node:
         path = dfs(st.session_state.graph, start_node, goal_node)
+        st.session_state.highlight = path
         if path:
             st.write(f"Path found: {' -> '.join(path)}")
         else:
@@ -66,9 +71,9 @@ if st.button("Start DFS Search"):
 # Visualize the graph
 st.subheader("Graph Visualization")
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue')
+    st.image(image)
 
 draw_graph()
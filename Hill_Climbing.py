@@ -1,12 +1,21 @@
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
-import random
+from aisearch.informed import hill_climbing
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Initialize heuristic values (for hill climbing) in session state
 if 'heuristics' not in st.session_state:
     st.session_state.heuristics = {}
@@ -15,35 +24,12 @@ if 'heuristics' not in st.session_state:
 def add_node(node, heuristic_value):
     st.session_state.graph.add_node(node)
     st.session_state.heuristics[node] = heuristic_value
+    st.session_state.graph_version += 1
 
 # Function to add edge between two nodes
 def add_edge(node1, node2):
     st.session_state.graph.add_edge(node1, node2)
-
-# Hill Climbing algorithm
-def hill_climbing(graph, start, goal):
-    current_node = start
-    path = [current_node]
-
-    while current_node != goal:
-        neighbors = list(graph.neighbors(current_node))
-
-        if not neighbors:
-            return None  # No path found
-
-        # Choose the neighbor with the best (lowest) heuristic value
-        next_node = min(neighbors, key=lambda n: st.session_state.heuristics[n])
-
-        if st.session_state.heuristics[next_node] >= st.session_state.heuristics[current_node]:
-            break  # Reached a peak (local maxima)
-
-        current_node = next_node
-        path.append(current_node)
-
-    if current_node == goal:
-        return path
-    else:
-        return None
+    st.session_state.graph_version += 1
 
 # Streamlit UI
 st.title("Hill Climbing Search Visualization")
@@ -65,6 +51,17 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2)
 
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name, {'heuristic': 'heuristics'})
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph, {'heuristic': 'heuristics'})
+
 # Select source and destination for Hill Climbing search
 st.subheader("Hill Climbing Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
@@ -73,7 +70,8 @@ goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes
 # Button to start Hill Climbing search
 if st.button("Start Hill Climbing Search"):
     if start_node and goal_node:
-        path = hill_climbing(st.session_state.graph, start_node, goal_node)
+        path = hill_climbing(st.session_state.graph, start_node, goal_node, st.session_state.heuristics)
+        st.session_state.highlight = path
         if path:
             st.write(f"Path found: {' -> '.join(path)}")
         else:
@@ -83,14 +81,10 @@ if st.button("Start Hill Climbing Search"):
 st.subheader("Graph Visualization")
 
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    
-    # Add heuristic values as node labels
-    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in st.session_state.graph.nodes}
-    nx.draw_networkx_labels(st.session_state.graph, pos, labels, font_size=12)
-    
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in graph.nodes}
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue', labels=labels)
+    st.image(image)
 
 draw_graph()
@@ -1,46 +1,60 @@
+import io
+
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
+from aisearch.adversarial import TranspositionTable, minimax
+from aisearch.bulk import load_graph, load_node_values, write_graph
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.DiGraph()  # Directed graph for the game tree
 
+# Graph version (bumped on every edit) and the layout drawn for it
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+
 # Initialize scores for leaf nodes in session state
 if 'scores' not in st.session_state:
     st.session_state.scores = {}
 
+# GraphML export of the graph and the graph version it was built for
+if 'export' not in st.session_state:
+    st.session_state.export = None
+    st.session_state.export_version = None
+
 # Function to add a node
 def add_node(node, is_leaf=False, score=None):
     st.session_state.graph.add_node(node)
     if is_leaf:
         st.session_state.scores[node] = score
+    st.session_state.graph_version += 1
 
 # Function to add an edge between two nodes
 def add_edge(parent, child):
     st.session_state.graph.add_edge(parent, child)
-
-# Minimax algorithm implementation
-def minimax(node, is_maximizing):
-    # If the node is a leaf, return its score
-    if node in st.session_state.scores:
-        return st.session_state.scores[node]
-
-    # Get all children of the current node
-    children = list(st.session_state.graph.successors(node))
-
-    if is_maximizing:
-        max_eval = float('-inf')
-        for child in children:
-            eval = minimax(child, False)
-            max_eval = max(max_eval, eval)
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for child in children:
-            eval = minimax(child, True)
-            min_eval = min(min_eval, eval)
-        return min_eval
+    st.session_state.graph_version += 1
+
+# Function to import edges (and GraphML leaf scores) and a separate leaf scores file
+def import_files(edge_file, values_file):
+    if edge_file is not None:
+        values = load_graph(st.session_state.graph, edge_file)
+        st.session_state.scores.update(values.get('score', {}))
+    if values_file is not None:
+        st.session_state.scores.update(load_node_values(values_file))
+    st.session_state.graph_version += 1
+
+# GraphML export of the graph with its leaf scores, rebuilt once per graph version
+def exported_graph():
+    if st.session_state.export_version != st.session_state.graph_version:
+        buffer = io.BytesIO()
+        write_graph(st.session_state.graph, buffer, format='graphml', node_values={'score': st.session_state.scores})
+        st.session_state.export = buffer.getvalue()
+        st.session_state.export_version = st.session_state.graph_version
+    return st.session_state.export
 
 # Streamlit UI
 st.title("Minimax Theorem Visualization")
@@ -65,6 +79,26 @@ if st.button("Add Edge"):
     if parent_node and child_node:
         add_edge(parent_node, child_node)
 
+# Bulk import and export
+st.subheader("Import and Export")
+edge_file = st.file_uploader("Edges file (edge list, CSV, Parquet or GraphML)", type=['txt', 'edges', 'csv', 'parquet', 'graphml'])
+values_file = st.file_uploader("Leaf scores file (node, value)", type=['txt', 'csv', 'parquet'])
+if st.button("Import"):
+    if edge_file is not None or values_file is not None:
+        import_files(edge_file, values_file)
+st.download_button("Export graph (GraphML)", exported_graph(), file_name='graph.graphml')
+
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name, {'score': 'scores'})
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=True))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph, {'score': 'scores'})
+
 # Select root node for Minimax search
 st.subheader("Run Minimax Search")
 root_node = st.selectbox("Select root node", st.session_state.graph.nodes)
@@ -72,24 +106,19 @@ root_node = st.selectbox("Select root node", st.session_state.graph.nodes)
 # Button to start Minimax search
 if st.button("Start Minimax Search"):
     if root_node:
-        result = minimax(root_node, True)  # True represents the maximizing player
+        table = TranspositionTable()  # Shared positions are evaluated once
+        result = minimax(st.session_state.graph, root_node, True, st.session_state.scores, table)  # True represents the maximizing player
         st.write(f"The optimal value for the root node {root_node} is: {result}")
+        st.write(f"Transposition table: {table.hits} hits, {table.misses} misses")
 
 # Visualize the game tree
 st.subheader("Game Tree Visualization")
 
 def draw_tree():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='lightgreen', node_size=1500, font_size=16)
-    
-    # Add leaf node scores as labels
-    labels = {node: f"{node}\n({st.session_state.scores[node]})" if node in st.session_state.scores else node for node in st.session_state.graph.nodes}
-    nx.draw_networkx_labels(st.session_state.graph, pos, labels, font_size=12)
-
-    # Draw edges
-    nx.draw_networkx_edges(st.session_state.graph, pos)
-    
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    labels = {node: f"{node}\n({st.session_state.scores[node]})" if node in st.session_state.scores else node for node in graph.nodes}
+    image = st.session_state.layout.png(graph, st.session_state.graph_version,
+                                        node_color='lightgreen', labels=labels)
+    st.image(image)
 
 draw_tree()
@@ -1,26 +1,73 @@
+import copy
+import io
+
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
+from aisearch.contraction import ContractionHierarchy
+from aisearch.uninformed import oracle_search
+from aisearch.bulk import load_graph, write_graph
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the oracle index and layout built for it,
+# and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'oracle_index' not in st.session_state:
+    st.session_state.oracle_index = None
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
+# Published graph this session opened and the graph version it was opened at
+if 'opened_graph' not in st.session_state:
+    st.session_state.opened_graph = (None, None)
+
+# GraphML export of the graph and the graph version it was built for
+if 'export' not in st.session_state:
+    st.session_state.export = None
+    st.session_state.export_version = None
+
 # Function to add node
 def add_node(node):
     st.session_state.graph.add_node(node)
+    st.session_state.graph_version += 1
 
 # Function to add edge between two nodes
 def add_edge(node1, node2, weight):
     st.session_state.graph.add_edge(node1, node2, weight=weight)
+    st.session_state.graph_version += 1
+
+# Function to import edges from an edge list, CSV, Parquet or GraphML file
+def import_files(edge_file):
+    load_graph(st.session_state.graph, edge_file)
+    st.session_state.graph_version += 1
+
+# GraphML export of the graph, rebuilt once per graph version
+def exported_graph():
+    if st.session_state.export_version != st.session_state.graph_version:
+        buffer = io.BytesIO()
+        write_graph(st.session_state.graph, buffer, format='graphml')
+        st.session_state.export = buffer.getvalue()
+        st.session_state.export_version = st.session_state.graph_version
+    return st.session_state.export
 
-# Oracle Search (simulated by finding the shortest path)
-def oracle_search(graph, start, goal):
-    try:
-        # Since the "oracle" knows the exact solution, we use NetworkX's shortest path function
-        return nx.shortest_path(graph, source=start, target=goal, weight='weight')
-    except nx.NetworkXNoPath:
-        return None  # No path exists between the start and goal
+# Build the contraction-hierarchy index for the current graph version (slow on
+# large graphs, so only on request). An opened published graph that is still
+# unedited uses the index built once for it
+def build_oracle_index():
+    shared, version = st.session_state.opened_graph
+    if shared is not None and version == st.session_state.graph_version:
+        index = copy.copy(shared.derived('oracle_index', ContractionHierarchy.build))
+        index.version = version
+    else:
+        index = ContractionHierarchy.build(st.session_state.graph, st.session_state.graph_version)
+    st.session_state.oracle_index = index
 
 # Streamlit UI
 st.title("Oracle Search Visualization")
@@ -42,15 +89,47 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2, weight)
 
-# Select source and destination for Oracle Search
+# Bulk import and export
+st.subheader("Import and Export")
+edge_file = st.file_uploader("Edges file (edge list, CSV, Parquet or GraphML)", type=['txt', 'edges', 'csv', 'parquet', 'graphml'])
+if st.button("Import"):
+    if edge_file is not None:
+        import_files(edge_file)
+st.download_button("Export graph (GraphML)", exported_graph(), file_name='graph.graphml')
+
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name)
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        shared = open_shared(shared_graph)
+        st.session_state.opened_graph = (shared, st.session_state.graph_version)
+
+# Index status; stale or missing indexes fall back to Dijkstra
 st.subheader("Oracle Search")
+if st.button("Build Index"):
+    if len(st.session_state.graph):
+        build_oracle_index()
+index = st.session_state.oracle_index
+if index is not None and not index.is_stale(st.session_state.graph_version):
+    st.write("Index is up to date: queries are answered from the contraction hierarchy.")
+else:
+    st.write("No index for the current graph: queries run Dijkstra until the index is built.")
+
+# Select source and destination for Oracle Search
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
 goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes)
 
 # Button to start Oracle Search
 if st.button("Start Oracle Search"):
     if start_node and goal_node:
-        path = oracle_search(st.session_state.graph, start_node, goal_node)
+        path = oracle_search(st.session_state.graph, start_node, goal_node,
+                             index=st.session_state.oracle_index, version=st.session_state.graph_version)
+        st.session_state.highlight = path
         if path:
             st.write(f"Oracle path found: {' -> '.join(path)}")
         else:
@@ -60,14 +139,10 @@ if st.button("Start Oracle Search"):
 st.subheader("Graph Visualization")
 
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    
-    # Draw edge weights
-    edge_labels = nx.get_edge_attributes(st.session_state.graph, 'weight')
-    nx.draw_networkx_edge_labels(st.session_state.graph, pos, edge_labels=edge_labels)
-    
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    edge_labels = nx.get_edge_attributes(graph, 'weight')
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue', edge_labels=edge_labels)
+    st.image(image)
 
 draw_graph()
@@ -1,55 +1,63 @@
+import io
+
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
-import heapq
+from aisearch.informed import a_star, ida_star, sma_star
+from aisearch.bulk import load_graph, load_node_values, write_graph
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Initialize heuristic values in session state
 if 'heuristics' not in st.session_state:
     st.session_state.heuristics = {}
 
+# GraphML export of the graph and the graph version it was built for
+if 'export' not in st.session_state:
+    st.session_state.export = None
+    st.session_state.export_version = None
+
 # Function to add a node with a heuristic value
 def add_node(node, heuristic_value):
     st.session_state.graph.add_node(node)
     st.session_state.heuristics[node] = heuristic_value
+    st.session_state.graph_version += 1
 
 # Function to add an edge between two nodes with weight
 def add_edge(node1, node2, weight):
     st.session_state.graph.add_edge(node1, node2, weight=weight)
-
-# A* search algorithm
-def a_star(graph, start, goal):
-    # Priority queue for paths (based on total estimated cost)
-    queue = [(st.session_state.heuristics[start], 0, start, [start])]  # (estimated_cost, actual_cost, current_node, path)
-    visited = set()
-    best_cost = {start: 0}  # Store the best known cost to reach each node
-
-    while queue:
-        # Pop the path with the lowest estimated cost
-        estimated_cost, current_cost, current_node, path = heapq.heappop(queue)
-
-        # If we reached the goal, return the path and cost
-        if current_node == goal:
-            return path, current_cost
-
-        # Skip if we already visited this node with a lower cost
-        if current_node in visited:
-            continue
-        visited.add(current_node)
-
-        # Explore neighbors (branch)
-        for neighbor in graph.neighbors(current_node):
-            new_cost = current_cost + graph[current_node][neighbor]['weight']
-            if neighbor not in best_cost or new_cost < best_cost[neighbor]:
-                best_cost[neighbor] = new_cost
-                total_estimated_cost = new_cost + st.session_state.heuristics[neighbor]  # Add heuristic to estimate
-                new_path = path + [neighbor]
-                heapq.heappush(queue, (total_estimated_cost, new_cost, neighbor, new_path))
-
-    return None, float('inf')  # If no path found
+    st.session_state.graph_version += 1
+
+# Function to import edges (and GraphML heuristic values) and a separate heuristic values file
+def import_files(edge_file, values_file):
+    if edge_file is not None:
+        values = load_graph(st.session_state.graph, edge_file)
+        st.session_state.heuristics.update(values.get('heuristic', {}))
+    if values_file is not None:
+        st.session_state.heuristics.update(load_node_values(values_file))
+    for node in st.session_state.graph.nodes:
+        st.session_state.heuristics.setdefault(node, 0.0)  # Admissible default
+    st.session_state.graph_version += 1
+
+# GraphML export of the graph with its heuristic values, rebuilt once per graph version
+def exported_graph():
+    if st.session_state.export_version != st.session_state.graph_version:
+        buffer = io.BytesIO()
+        write_graph(st.session_state.graph, buffer, format='graphml', node_values={'heuristic': st.session_state.heuristics})
+        st.session_state.export = buffer.getvalue()
+        st.session_state.export_version = st.session_state.graph_version
+    return st.session_state.export
 
 # Streamlit UI
 st.title("A* Search Algorithm Visualization")
@@ -72,17 +80,58 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2, weight)
 
+# Bulk import and export
+st.subheader("Import and Export")
+edge_file = st.file_uploader("Edges file (edge list, CSV, Parquet or GraphML)", type=['txt', 'edges', 'csv', 'parquet', 'graphml'])
+values_file = st.file_uploader("Heuristic values file (node, value)", type=['txt', 'csv', 'parquet'])
+if st.button("Import"):
+    if edge_file is not None or values_file is not None:
+        import_files(edge_file, values_file)
+st.download_button("Export graph (GraphML)", exported_graph(), file_name='graph.graphml')
+
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name, {'heuristic': 'heuristics'})
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph, {'heuristic': 'heuristics'})
+
 # Select source and destination for A* search
 st.subheader("A* Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
 goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes)
+algorithm = st.selectbox("Algorithm", ["A*", "IDA* (iterative deepening)", "SMA* (memory-bounded)"])
+if algorithm == "A*":
+    epsilon = st.number_input("Suboptimality epsilon (0 for an optimal path, cost stays within (1 + epsilon) x optimal):", min_value=0.0, value=0.0)
+    focal = st.checkbox("Focal search instead of weighted A*")
+else:
+    epsilon = 0.0
+    max_memory_nodes = st.number_input("Maximum nodes kept in memory:", min_value=2, value=1000, step=1)
 
 # Button to start A* search
 if st.button("Start A* Search"):
     if start_node and goal_node:
-        path, cost = a_star(st.session_state.graph, start_node, goal_node)
-        if path:
+        stats = {}
+        if algorithm == "A*":
+            path, cost = a_star(st.session_state.graph, start_node, goal_node, st.session_state.heuristics, stats, epsilon=epsilon, focal=focal)
+        elif algorithm.startswith("IDA*"):
+            path, cost = ida_star(st.session_state.graph, start_node, goal_node, st.session_state.heuristics, stats, max_memory_nodes=int(max_memory_nodes))
+        else:
+            path, cost = sma_star(st.session_state.graph, start_node, goal_node, st.session_state.heuristics, stats, max_memory_nodes=int(max_memory_nodes))
+        st.session_state.highlight = path
+        if path and epsilon:
+            st.write(f"Path found: {' -> '.join(path)} with cost: {cost} (at most {1 + epsilon:g} x optimal)")
+        elif path and algorithm.startswith("SMA*"):
+            # Optimal only if the optimal path fits in max_memory_nodes
+            st.write(f"Path found: {' -> '.join(path)} with cost: {cost} (may be suboptimal when memory runs out)")
+        elif path:
             st.write(f"Optimal Path found: {' -> '.join(path)} with cost: {cost}")
+        if path:
+            st.write(f"Nodes expanded: {stats.get('settled', stats.get('expanded'))}")
         else:
             st.write("No path found!")
 
@@ -90,18 +139,11 @@ if st.button("Start A* Search"):
 st.subheader("Graph Visualization")
 
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    
-    # Add heuristic values as node labels
-    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in st.session_state.graph.nodes}
-    nx.draw_networkx_labels(st.session_state.graph, pos, labels, font_size=12)
-
-    # Draw edge weights
-    edge_labels = nx.get_edge_attributes(st.session_state.graph, 'weight')
-    nx.draw_networkx_edge_labels(st.session_state.graph, pos, edge_labels=edge_labels)
-    
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in graph.nodes}
+    edge_labels = nx.get_edge_attributes(graph, 'weight')
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue', labels=labels, edge_labels=edge_labels)
+    st.image(image)
 
 draw_graph()
@@ -0,0 +1,28 @@
+# Headless search algorithms shared by the Streamlit pages
+from aisearch.uninformed import (
+    bfs,
+    bfs_levels,
+    dfs,
+    bidirectional_search,
+    bidirectional_dijkstra,
+    branch_and_bound,
+    oracle_search,
+)
+from aisearch.informed import (
+    a_star,
+    ida_star,
+    sma_star,
+    beam_search,
+    hill_climbing,
+    branch_and_bound_greedy,
+    branch_and_bound_greedy_exit,
+    branch_and_bound_anytime,
+    branch_and_bound_heuristic,
+    branch_and_bound_greedy_heuristic,
+)
+from aisearch.adversarial import minimax, alpha_beta
+from aisearch.batch import batch_shortest_paths
+from aisearch.bulk import load_csr, load_graph, load_node_values, write_graph, write_node_values
+from aisearch.csr import CSRGraph
+from aisearch.implicit import ImplicitGraph
+from aisearch.store import GraphStore, Overlay, OverlayDiGraph, OverlayGraph
@@ -0,0 +1,330 @@
+# Adversarial search over game trees stored as directed graphs; leaf scores are
+# passed in as a mapping from node to score. On an ImplicitGraph (see
+# aisearch.implicit) scores can also be a function of the state.
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from aisearch.core import UNSEEN
+
+
+# Cache of minimax values keyed on (node, is_maximizing). Game graphs are DAGs,
+# so a position reached by several move orders is only evaluated once.
+# With max_size set, the least recently used entry is evicted when full.
+class TranspositionTable:
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Return the cached value for `key`, or UNSEEN on a miss
+    def get(self, key):
+        value = self.entries.get(key, UNSEEN)
+        if value is UNSEEN:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if self.max_size is not None and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Minimax algorithm implementation; pass a TranspositionTable to evaluate
+# each distinct (position, player) once, and a stats dict to count visited nodes
+def minimax(graph, node, is_maximizing, scores, table=None, stats=None):
+    if callable(scores):
+        scores = graph.node_values(scores)
+    if stats is not None:
+        stats['nodes'] = stats.get('nodes', 0) + 1
+
+    # If the node is a leaf, return its score
+    if node in scores:
+        return scores[node]
+
+    if table is not None:
+        cached = table.get((node, is_maximizing))
+        if cached is not UNSEEN:
+            return cached
+
+    # Get all children of the current node
+    children = list(graph.successors(node))
+
+    if is_maximizing:
+        best_eval = float('-inf')
+        for child in children:
+            eval = minimax(graph, child, False, scores, table, stats)
+            best_eval = max(best_eval, eval)
+    else:
+        best_eval = float('inf')
+        for child in children:
+            eval = minimax(graph, child, True, scores, table, stats)
+            best_eval = min(best_eval, eval)
+
+    if table is not None:
+        table.put((node, is_maximizing), best_eval)
+    return best_eval
+
+
+# Move ordering for alpha_beta(). The base class keeps the order in which
+# graph.successors() returns the children.
+class MoveOrdering:
+    # Return `children` of `node` in the order they should be searched
+    def order(self, node, children, is_maximizing, ply):
+        return children
+
+    # Called when searching `child` caused a cutoff at `node`
+    def cutoff(self, node, child, ply, depth):
+        pass
+
+
+# Order children by static score hints (leaf scores or estimates), most
+# promising first for the side to move; children without a hint count as 0
+class StaticOrdering(MoveOrdering):
+    def __init__(self, hints):
+        self.hints = hints
+
+    def order(self, node, children, is_maximizing, ply):
+        hints = self.hints
+        return sorted(children, key=lambda child: hints.get(child, 0), reverse=is_maximizing)
+
+
+# Killer and history heuristics: children that caused cutoffs at the same ply
+# (killers) are tried first, then children by how often, and how deep, they
+# caused cutoffs anywhere (history). Optional static hints break the remaining ties.
+class HistoryOrdering(MoveOrdering):
+    def __init__(self, hints=None, killer_slots=2):
+        self.hints = hints or {}
+        self.killer_slots = killer_slots
+        self.killers = {}  # ply -> most recent cutoff children
+        self.history = {}  # child -> accumulated cutoff weight
+
+    def order(self, node, children, is_maximizing, ply):
+        killers = self.killers.get(ply, ())
+        history = self.history
+        hints = self.hints
+        sign = -1 if is_maximizing else 1
+        return sorted(children, key=lambda child: (
+            child not in killers,
+            -history.get(child, 0),
+            sign * hints.get(child, 0),
+        ))
+
+    def cutoff(self, node, child, ply, depth):
+        killers = self.killers.setdefault(ply, [])
+        if child not in killers:
+            killers.insert(0, child)
+            del killers[self.killer_slots:]
+        weight = depth if depth is not None else 1
+        self.history[child] = self.history.get(child, 0) + weight * weight
+
+
+# Alpha-beta search with pluggable move ordering, an optional depth limit and
+# a table of best moves from earlier searches that is tried before anything else
+class _AlphaBeta:
+    def __init__(self, graph, scores, ordering=None, stats=None, best_moves=None, evaluate=None):
+        self.graph = graph
+        self.scores = scores
+        self.ordering = ordering or MoveOrdering()
+        self.stats = stats if stats is not None else {}
+        self.best_moves = best_moves if best_moves is not None else {}
+        self.evaluate = evaluate or {}
+        self.hit_horizon = False
+        self.stats.setdefault('nodes', 0)
+
+    def search(self, node, alpha, beta, is_maximizing, depth=None, ply=0):
+        self.stats['nodes'] += 1
+
+        # If the node is a leaf, return its score
+        if node in self.scores:
+            return self.scores[node]
+
+        # Depth limit reached on an inner node: use its static estimate
+        if depth == 0:
+            self.hit_horizon = True
+            return self.evaluate.get(node, 0)
+
+        # Get all children of the current node, best move from the last search first
+        children = self.ordering.order(node, list(self.graph.successors(node)), is_maximizing, ply)
+        best_move = self.best_moves.get(node)
+        if best_move in children:
+            children.remove(best_move)
+            children.insert(0, best_move)
+
+        child_depth = depth - 1 if depth is not None else None
+        best_child = None
+        if is_maximizing:
+            best_eval = float('-inf')
+            for child in children:
+                eval = self.search(child, alpha, beta, False, child_depth, ply + 1)
+                if eval > best_eval or best_child is None:
+                    best_eval, best_child = eval, child
+                alpha = max(alpha, eval)
+                if beta <= alpha:
+                    self.ordering.cutoff(node, child, ply, depth)
+                    break  # Beta cutoff
+        else:
+            best_eval = float('inf')
+            for child in children:
+                eval = self.search(child, alpha, beta, True, child_depth, ply + 1)
+                if eval < best_eval or best_child is None:
+                    best_eval, best_child = eval, child
+                beta = min(beta, eval)
+                if beta <= alpha:
+                    self.ordering.cutoff(node, child, ply, depth)
+                    break  # Alpha cutoff
+
+        if best_child is not None:
+            self.best_moves[node] = best_child
+        return best_eval
+
+
+# Alpha-beta pruning algorithm; `ordering` is a MoveOrdering, and `stats`
+# (a dict) receives the number of visited nodes under 'nodes'
+def alpha_beta(graph, node, alpha, beta, is_maximizing, scores, ordering=None, stats=None):
+    if callable(scores):
+        scores = graph.node_values(scores)
+    return _AlphaBeta(graph, scores, ordering, stats).search(node, alpha, beta, is_maximizing)
+
+
+# Iterative-deepening alpha-beta: searches to depth 1, 2, ... and starts every
+# iteration with the previous iteration's best line. Inner nodes at the depth
+# limit are valued by `hints` (0 if missing). Stops after max_depth, or once an
+# iteration reaches every leaf, in which case the value is exact.
+# Returns (value, principal variation).
+def iterative_deepening(graph, root, scores, is_maximizing=True, max_depth=None, hints=None, ordering=None, stats=None):
+    if callable(scores):
+        scores = graph.node_values(scores)
+    if ordering is None:
+        ordering = HistoryOrdering(hints)
+    stats = stats if stats is not None else {}
+    best_moves = {}
+    depth = 0
+    while True:
+        depth += 1
+        search = _AlphaBeta(graph, scores, ordering, stats, best_moves, hints)
+        value = search.search(root, float('-inf'), float('inf'), is_maximizing, depth)
+        stats['depth'] = depth
+        if not search.hit_horizon or depth == max_depth:
+            break
+    return value, principal_variation(root, best_moves, scores)
+
+
+# Follow the recorded best moves from `root` down to a leaf
+def principal_variation(root, best_moves, scores):
+    line = [root]
+    seen = {root}
+    node = root
+    while node not in scores and node in best_moves:
+        node = best_moves[node]
+        if node in seen:
+            break
+        seen.add(node)
+        line.append(node)
+    return line
+
+
+# State shared by the worker processes of parallel_alpha_beta()
+_worker = {}
+
+
+def _init_worker(graph, scores, bound, root_is_maximizing):
+    if callable(scores):
+        scores = graph.node_values(scores)
+    _worker['graph'] = graph
+    _worker['scores'] = scores
+    _worker['bound'] = bound
+    _worker['root_is_maximizing'] = root_is_maximizing
+
+
+# Alpha-beta that, at the top of a worker's subtree, narrows its window with
+# the best root value other workers have published so far
+class _SharedBoundAlphaBeta(_AlphaBeta):
+    def __init__(self, graph, scores, bound, root_is_maximizing):
+        super().__init__(graph, scores)
+        self.bound = bound
+        self.root_is_maximizing = root_is_maximizing
+
+    def search(self, node, alpha, beta, is_maximizing, depth=None, ply=0):
+        if ply != 0 or node in self.scores:
+            return super().search(node, alpha, beta, is_maximizing, depth, ply)
+
+        # Search the root child one grandchild at a time, refreshing the bound in between
+        self.stats['nodes'] += 1
+        best_eval = float('-inf') if is_maximizing else float('inf')
+        for child in self.graph.successors(node):
+            if self.root_is_maximizing:
+                alpha = max(alpha, self.bound.value)
+            else:
+                beta = min(beta, self.bound.value)
+            if beta <= alpha:
+                break
+            eval = super().search(child, alpha, beta, not is_maximizing, depth, ply + 1)
+            if is_maximizing:
+                best_eval = max(best_eval, eval)
+                alpha = max(alpha, eval)
+            else:
+                best_eval = min(best_eval, eval)
+                beta = min(beta, eval)
+            if beta <= alpha:
+                break
+        return best_eval
+
+
+# Evaluate one root child in a worker and publish its value if it improves the bound
+def _search_root_child(child):
+    bound = _worker['bound']
+    root_is_maximizing = _worker['root_is_maximizing']
+    search = _SharedBoundAlphaBeta(_worker['graph'], _worker['scores'], bound, root_is_maximizing)
+    value = search.search(child, float('-inf'), float('inf'), not root_is_maximizing)
+    with bound.get_lock():
+        if (value > bound.value) if root_is_maximizing else (value < bound.value):
+            bound.value = value
+    return value, search.stats['nodes']
+
+
+# Parallel root-split alpha-beta. The first root child is searched serially to
+# set a bound (young brothers wait); the remaining children are spread across a
+# process pool whose workers share that bound and tighten it as they finish.
+# Children whose search fails against the shared bound return a bound, not an
+# exact value, but never one that beats the true best, so the root value is
+# exactly the minimax value. Returns the same value as alpha_beta().
+#
+# On an ImplicitGraph, `scores` can be a function of the state as for
+# alpha_beta(); each worker then evaluates it on its own. The graph and the
+# scores are sent to the workers, so their functions must be picklable
+# (defined at module level) where processes are not forked.
+def parallel_alpha_beta(graph, root, scores, is_maximizing=True, workers=None, stats=None):
+    stats = stats if stats is not None else {}
+    stats['nodes'] = 1
+    root_scores = graph.node_values(scores) if callable(scores) else scores
+    if root in root_scores:
+        return root_scores[root]
+    children = list(graph.successors(root))
+    if not children:
+        return float('-inf') if is_maximizing else float('inf')
+
+    first = _AlphaBeta(graph, root_scores)
+    best = first.search(children[0], float('-inf'), float('inf'), not is_maximizing)
+    stats['nodes'] += first.stats['nodes']
+
+    bound = multiprocessing.Value('d', best)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph, scores, bound, is_maximizing)) as pool:
+        for value, nodes in pool.map(_search_root_child, children[1:]):
+            best = max(best, value) if is_maximizing else min(best, value)
+            stats['nodes'] += nodes
+    return best
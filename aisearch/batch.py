@@ -0,0 +1,90 @@
+# Batched point-to-point queries. Queries are grouped by source and each
+# distinct source gets one single-source search, which stops as soon as all of
+# that source's targets are settled and answers all of them at once.
+import heapq
+
+import numpy as np
+
+from aisearch.csr import CSRGraph
+from aisearch.uninformed import _bfs_levels
+
+
+# Shortest-path costs for the queries (sources[i], targets[i]). On a CSRGraph,
+# sources and targets are arrays of node IDs; a networkx graph is frozen to a
+# CSRGraph first and they are node names. Returns a float array of costs (inf
+# where the target is unreachable): edge-weight sums with weighted=True, hop
+# counts otherwise (one NumPy level-synchronous BFS per source). With
+# paths=True, also returns a list with each query's path as node names (None if
+# unreachable).
+def batch_shortest_paths(graph, sources, targets, weighted=True, paths=False):
+    if isinstance(graph, CSRGraph):
+        csr = graph
+        source_ids = np.asarray(sources, dtype=np.int64)
+        target_ids = np.asarray(targets, dtype=np.int64)
+    else:
+        csr = CSRGraph.from_networkx(graph)
+        source_ids = np.array([csr.id_of(node) for node in sources], dtype=np.int64)
+        target_ids = np.array([csr.id_of(node) for node in targets], dtype=np.int64)
+    if source_ids.shape != target_ids.shape:
+        raise ValueError("sources and targets must have the same length")
+
+    costs = np.full(len(source_ids), np.inf)
+    found = [None] * len(source_ids) if paths else None
+
+    # Query indices sorted by source; each run of equal sources is one group
+    order = np.argsort(source_ids, kind='stable')
+    group_sources, group_starts = np.unique(source_ids[order], return_index=True)
+    group_ends = np.append(group_starts[1:], len(order))
+
+    for source, begin, end in zip(group_sources.tolist(), group_starts.tolist(), group_ends.tolist()):
+        queries = order[begin:end]
+        goals = target_ids[queries]
+        if weighted:
+            distances, parents = _dijkstra_until(csr, source, goals)
+        else:
+            distances, parents = _bfs_levels(csr, source, goals)
+            distances = np.where(distances >= 0, distances, np.inf)
+        costs[queries] = distances[goals]
+        if paths:
+            parents = parents.tolist()
+            for query, goal in zip(queries.tolist(), goals.tolist()):
+                if costs[query] < np.inf:
+                    found[query] = csr.to_names(_follow(parents, goal))
+
+    return (costs, found) if paths else costs
+
+
+# Single-source Dijkstra over a CSRGraph that stops once every node in `goals`
+# is settled. Returns (distances, parents) arrays by node ID (inf and -1 for
+# nodes not reached).
+def _dijkstra_until(csr, source, goals):
+    indptr, indices, weights = csr._adjacency_lists()
+    inf = float('inf')
+    distances = [inf] * len(csr)
+    parents = [-1] * len(csr)
+    distances[source] = 0.0
+    remaining = set(goals.tolist())
+    queue = [(0.0, source)]
+    while queue and remaining:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue  # Stale entry
+        remaining.discard(node)
+        for i in range(indptr[node], indptr[node + 1]):
+            new_distance = distance + weights[i]
+            neighbor = indices[i]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                parents[neighbor] = node
+                heapq.heappush(queue, (new_distance, neighbor))
+    return np.array(distances), np.array(parents)
+
+
+# Rebuild the path to `node` from a parent array (-1 marks the source)
+def _follow(parents, node):
+    path = []
+    while node != -1:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
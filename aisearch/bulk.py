@@ -0,0 +1,403 @@
+# Bulk import/export of session graphs. Files are read and written in chunks
+# of `chunk_size` rows, so besides the graph itself only one chunk is held in
+# memory at a time. Formats: whitespace-separated edge lists ('edgelist'),
+# 'csv', 'parquet' (needs pyarrow) and 'graphml'; by default the format is
+# taken from the file extension. Sources and targets are paths or open binary
+# files (e.g. a Streamlit upload, or io.BytesIO for a download button).
+#
+# Loading into networkx costs a few microseconds per edge in networkx itself;
+# load_csr() skips it and builds a CSRGraph straight from the chunks with
+# NumPy, which is the way to read multi-million-edge files in seconds.
+import contextlib
+import csv
+import io
+import itertools
+import os
+import warnings
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+from aisearch.csr import CSRGraph
+
+EXTENSIONS = {
+    '.txt': 'edgelist', '.edges': 'edgelist', '.edgelist': 'edgelist', '.el': 'edgelist',
+    '.csv': 'csv',
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.graphml': 'graphml', '.xml': 'graphml',
+}
+EDGE_COLUMNS = ('source', 'target', 'weight')
+VALUE_COLUMNS = ('node', 'value')
+
+GRAPHML_TYPES = {'int': int, 'long': int, 'float': float, 'double': float, 'string': str,
+                 'boolean': lambda text: text.strip().lower() in ('true', '1')}
+GRAPHML_NAMESPACE = '{http://graphml.graphdrawing.org/xmlns}'
+
+
+# Format name for `file` (a path or a file object with a `name`), or `format`
+# itself when given
+def file_format(file, format=None):
+    if format is not None:
+        return format
+    name = os.fspath(file) if isinstance(file, (str, os.PathLike)) else getattr(file, 'name', '')
+    extension = os.path.splitext(str(name))[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of {name!r}; pass format= one of {sorted(set(EXTENSIONS.values()))}")
+    return EXTENSIONS[extension]
+
+
+# Add the edges in `source` to the networkx `graph` (nodes are created as
+# needed). Edge lists and CSV/Parquet files have source, target and an optional
+# weight column. The first row of an edge list or CSV file is a header when its
+# weight column is not a number; columns are then matched by name when there is
+# a `source` column, by position otherwise. Node names are converted with
+# `nodetype`. Returns the node attributes found in a GraphML file as
+# {attribute: {node: value}} (e.g. heuristics or scores), {} for other formats.
+def load_graph(graph, source, format=None, weight='weight', nodetype=str, chunk_size=100_000):
+    format = file_format(source, format)
+    if format == 'graphml':
+        return _load_graphml(graph, source, weight, nodetype, chunk_size)
+    for sources, targets, weights in _read_columns(source, format, EDGE_COLUMNS, chunk_size):
+        sources, targets = map(nodetype, sources), map(nodetype, targets)
+        if None not in weights and '' not in weights:
+            graph.add_weighted_edges_from(zip(sources, targets, map(float, weights)), weight=weight)
+            continue
+        for u, v, w in zip(sources, targets, weights):
+            if w is None or w == '':
+                graph.add_edge(u, v)
+            else:
+                graph.add_edge(u, v, **{weight: float(w)})
+    return {}
+
+
+# A CSRGraph of the edges in an edge list, CSV or Parquet file (missing weights
+# are `default_weight`). Like a networkx graph, repeated edges keep the last
+# weight; neighbors are ordered by node ID, and IDs follow the order in which
+# names first appear. Chunks are parsed into NumPy arrays and all names are
+# numbered at once at the end, so the name columns of the whole file are held
+# as arrays (4 bytes per character of a name) until the graph is built.
+def load_csr(source, format=None, directed=False, nodetype=str, default_weight=1.0, chunk_size=100_000):
+    columns, weights = [], []  # Name arrays, sources then targets of each chunk
+    for sources, targets, w in _read_arrays(source, file_format(source, format), EDGE_COLUMNS, chunk_size):
+        for column in (sources, targets):
+            if nodetype in (str, int, float):
+                columns.append(column.astype(nodetype, copy=False))
+            else:
+                columns.append(np.array([nodetype(name) for name in column.tolist()]))
+        weights.append(np.where(np.isnan(w), default_weight, w))
+    if not columns:
+        return CSRGraph(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0), [], directed=directed)
+
+    # Number the names in order of first appearance
+    lengths = [len(column) for column in columns]
+    unique, first, inverse = np.unique(np.concatenate(columns), return_index=True, return_inverse=True)
+    del columns
+    by_appearance = np.argsort(first)
+    rank = np.empty(len(unique), dtype=np.int32)
+    rank[by_appearance] = np.arange(len(unique), dtype=np.int32)
+    ids = np.split(rank[inverse.reshape(-1)], np.cumsum(lengths)[:-1])
+    del inverse
+    u, v = np.concatenate(ids[0::2]), np.concatenate(ids[1::2])
+    w, order = np.concatenate(weights), np.arange(len(u), dtype=np.int32)
+    del ids, weights
+    if not directed:
+        loops = u == v  # Stored once, like networkx does
+        u, v = np.concatenate([u, v[~loops]]), np.concatenate([v, u[~loops]])
+        w, order = np.concatenate([w, w[~loops]]), np.concatenate([order, order[~loops]])
+
+    # Sort by (source, target, file position) and keep the last of each pair
+    n = len(unique)
+    pairs = u.astype(np.int64) * max(n, 1) + v
+    sort = np.lexsort((order, pairs))
+    pairs = pairs[sort]
+    last = np.append(pairs[1:] != pairs[:-1], True)
+    sort = sort[last]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u[sort], minlength=n), out=indptr[1:])
+    return CSRGraph(indptr, v[sort], w[sort], unique[by_appearance].tolist(), directed=directed)
+
+
+# Per-node values (heuristics, scores) from a two-column file of node and
+# value, as a {node: float} dict ready to merge into the page's table
+def load_node_values(source, format=None, nodetype=str, chunk_size=100_000):
+    values = {}
+    for nodes, numbers in _read_columns(source, file_format(source, format), VALUE_COLUMNS, chunk_size):
+        values.update(zip(map(nodetype, nodes), map(float, numbers)))
+    return values
+
+
+# Write the edges of `graph` (with their `weight`, when set) to `target`.
+# GraphML files also get the nodes, with `node_values` ({attribute: {node:
+# value}}) stored as node attributes.
+def write_graph(graph, target, format=None, weight='weight', node_values=None, chunk_size=100_000):
+    format = file_format(target, format)
+    if format == 'graphml':
+        return _write_graphml(graph, target, weight, node_values or {}, chunk_size)
+    rows = ((u, v, w) for u, v, w in graph.edges(data=weight))
+    _write_rows(target, format, EDGE_COLUMNS, rows, chunk_size)
+
+
+# Write {node: value} as a two-column node, value file
+def write_node_values(values, target, format=None, chunk_size=100_000):
+    _write_rows(target, file_format(target, format), VALUE_COLUMNS, values.items(), chunk_size)
+
+
+# Text stream over a path or binary file; files opened here are closed on exit
+@contextlib.contextmanager
+def _open_text(file, mode='r'):
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, mode, encoding='utf-8', newline='') as stream:
+            yield stream
+    elif isinstance(file, io.TextIOBase):
+        yield file
+    else:
+        stream = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        try:
+            yield stream
+        finally:
+            stream.detach()  # Leave the caller's file open
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow (pip install pyarrow)") from None
+    return pyarrow, pyarrow.parquet
+
+
+# Chunks of up to `chunk_size` rows, as one sequence per name in `columns`
+# (None for a missing column or a missing trailing field). Rows are split and
+# transposed with builtins, never field by field in Python.
+def _read_columns(source, format, columns, chunk_size):
+    if format == 'parquet':
+        yield from _read_parquet_columns(source, columns, chunk_size)
+        return
+    if format not in ('edgelist', 'csv'):
+        raise ValueError(f"Unknown format {format!r}")
+    with _open_text(source) as stream:
+        records = map(str.split, stream) if format == 'edgelist' else csv.reader(stream)
+        positions = None
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+            chunk = list(filter(None, chunk))  # Blank lines
+            if format == 'edgelist':
+                chunk = [fields for fields in chunk if fields[0][0] != '#']
+            if not chunk:
+                continue
+            if positions is None:
+                positions = _header_positions(chunk[0], columns)
+                if positions is None:
+                    positions = list(range(len(columns)))
+                else:
+                    chunk = chunk[1:]
+                    if not chunk:
+                        continue
+            width = max(i for i in positions if i is not None) + 1
+            if min(map(len, chunk), default=width) < width:
+                chunk = [fields + [None] * (width - len(fields)) for fields in chunk]
+            fields = list(zip(*chunk))
+            yield tuple(fields[i] if i is not None else (None,) * len(chunk) for i in positions)
+
+
+# Same chunks as _read_columns(), for load_csr(): NumPy arrays of names and a
+# float64 array of the last column, NaN where it is missing. Edge lists and CSV
+# files are parsed by np.loadtxt a chunk of lines at a time, so no Python
+# object is made per field; a chunk with rows of different lengths is split
+# in Python instead.
+def _read_arrays(source, format, columns, chunk_size):
+    if format == 'parquet':
+        for chunk in _read_parquet_columns(source, columns, chunk_size):
+            yield tuple(np.array(column) for column in chunk[:-1]) + (np.array(chunk[-1], dtype=np.float64),)
+        return
+    if format not in ('edgelist', 'csv'):
+        raise ValueError(f"Unknown format {format!r}")
+    if format == 'csv':
+        options = dict(delimiter=',', quotechar='"', comments=None)
+        split = lambda line: next(csv.reader([line]), [])
+    else:
+        options = dict(comments='#')
+        split = lambda line: [] if line.lstrip().startswith('#') else line.split()
+    with _open_text(source) as stream:
+        positions = None
+        while True:
+            lines = list(itertools.islice(stream, chunk_size))
+            if not lines:
+                return
+            if positions is None:
+                rows = ((index, split(line)) for index, line in enumerate(lines))
+                index, fields = next(((index, fields) for index, fields in rows if fields), (None, None))
+                if fields is None:
+                    continue  # Only blank lines and comments so far
+                positions = _header_positions(fields, columns)
+                if positions is None:
+                    positions = list(range(len(columns)))
+                else:
+                    del lines[:index + 1]
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')  # A chunk of only blank lines and comments
+                    table = np.loadtxt(lines, dtype=str, ndmin=2, **options)
+            except ValueError:  # Rows of different lengths
+                rows = [fields for fields in map(split, lines) if fields]
+                width = max(map(len, rows))
+                table = np.array([fields + [''] * (width - len(fields)) for fields in rows], dtype=str)
+            if not len(table):
+                continue
+            missing = np.full(len(table), '')
+            arrays = [table[:, i] if i is not None and i < table.shape[1] else missing for i in positions]
+            values = np.full(len(table), np.nan)
+            present = arrays[-1] != ''
+            values[present] = arrays[-1][present].astype(np.float64)
+            yield tuple(arrays[:-1]) + (values,)
+
+
+# Positions of `columns` if `fields` is a header row, None for a data row. The
+# last column (weight or value) is a number in every data row, so a row whose
+# field there is not a number is a header; a row without that field is a
+# header only if it starts with the first column's name.
+def _header_positions(fields, columns):
+    header = [name.strip().lower() for name in fields]
+    number = len(columns) - 1
+    if number < len(header) and header[number]:
+        try:
+            float(header[number])
+            return None
+        except ValueError:
+            pass
+    elif header[0] != columns[0]:
+        return None
+    if columns[0] in header:
+        return [header.index(name) if name in header else None for name in columns]
+    return list(range(len(columns)))
+
+
+def _read_parquet_columns(source, columns, chunk_size):
+    _, parquet = _parquet()
+    file = parquet.ParquetFile(source)
+    names = file.schema_arrow.names
+    if columns[0] in names:
+        present = [name if name in names else None for name in columns]
+    else:
+        present = names[:len(columns)] + [None] * (len(columns) - len(names))
+    for batch in file.iter_batches(batch_size=chunk_size, columns=[name for name in present if name]):
+        length = batch.num_rows
+        yield tuple(batch.column(batch.schema.get_field_index(name)).to_pylist() if name else [None] * length
+                    for name in present)
+
+
+def _write_rows(target, format, columns, rows, chunk_size):
+    rows = iter(rows)
+    if format == 'parquet':
+        pyarrow, parquet = _parquet()
+        types = [pyarrow.string()] * (len(columns) - 1) + [pyarrow.float64()]
+        schema = pyarrow.schema(list(zip(columns, types)))
+        with parquet.ParquetWriter(target, schema) as writer:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    return
+                fields = [list(column) for column in zip(*chunk)]
+                arrays = [pyarrow.array([str(name) for name in column]) for column in fields[:-1]]
+                arrays.append(pyarrow.array(fields[-1], type=pyarrow.float64()))
+                writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+    if format not in ('edgelist', 'csv'):
+        raise ValueError(f"Unknown format {format!r}")
+    with _open_text(target, 'w') as stream:
+        if format == 'csv':
+            writer = csv.writer(stream, lineterminator='\n')
+            writer.writerow(columns)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            if format == 'csv':
+                writer.writerows(tuple('' if field is None else field for field in row) for row in chunk)
+            else:
+                stream.writelines(' '.join(str(field) for field in row if field is not None) + '\n' for row in chunk)
+
+
+# Streaming GraphML reader: <node> and <edge> elements are handled and dropped
+# as soon as they are parsed, so the XML tree never holds more than one of them
+def _load_graphml(graph, source, weight, nodetype, chunk_size):
+    keys = {}  # key id -> (attribute name, converter)
+    node_values = {}
+    nodes, edges = [], []
+    parent = None
+    stream = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        for event, element in iterparse(stream, events=('start', 'end')):
+            tag = element.tag.replace(GRAPHML_NAMESPACE, '')
+            if event == 'start':
+                if tag == 'graph':
+                    parent = element
+                continue
+            if tag == 'key':
+                keys[element.get('id')] = (element.get('attr.name', element.get('id')),
+                                           GRAPHML_TYPES.get(element.get('attr.type'), str))
+            elif tag == 'node':
+                node = nodetype(element.get('id'))
+                nodes.append(node)
+                for name, value in _graphml_data(element, keys):
+                    node_values.setdefault(name, {})[node] = value
+            elif tag == 'edge':
+                data = dict(_graphml_data(element, keys))
+                if weight != 'weight' and 'weight' in data:
+                    data[weight] = data.pop('weight')
+                edges.append((nodetype(element.get('source')), nodetype(element.get('target')), data))
+            else:
+                continue
+            if parent is not None and tag in ('node', 'edge'):
+                parent.remove(element)
+            if len(nodes) >= chunk_size:
+                graph.add_nodes_from(nodes)
+                nodes = []
+            if len(edges) >= chunk_size:
+                graph.add_edges_from(edges)
+                edges = []
+    finally:
+        if stream is not source:
+            stream.close()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return node_values
+
+
+def _graphml_data(element, keys):
+    for data in element:
+        if data.tag.replace(GRAPHML_NAMESPACE, '') == 'data' and data.get('key') in keys:
+            name, convert = keys[data.get('key')]
+            yield name, convert(data.text or '')
+
+
+def _write_graphml(graph, target, weight, node_values, chunk_size):
+    value_keys = {name: f'v{i}' for i, name in enumerate(node_values)}
+    with _open_text(target, 'w') as stream:
+        stream.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                     '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                     f'  <key id="w" for="edge" attr.name={quoteattr(weight)} attr.type="double"/>\n')
+        for name, key in value_keys.items():
+            stream.write(f'  <key id="{key}" for="node" attr.name={quoteattr(str(name))} attr.type="double"/>\n')
+        stream.write(f'  <graph edgedefault="{"directed" if graph.is_directed() else "undirected"}">\n')
+
+        def node_element(node):
+            data = ''.join(f'<data key="{value_keys[name]}">{values[node]}</data>'
+                           for name, values in node_values.items() if values.get(node) is not None)
+            return f'    <node id={quoteattr(str(node))}>{data}</node>\n'
+
+        def edge_element(u, v, w):
+            data = '' if w is None else f'<data key="w">{escape(str(w))}</data>'
+            return f'    <edge source={quoteattr(str(u))} target={quoteattr(str(v))}>{data}</edge>\n'
+
+        for elements in (map(node_element, graph.nodes),
+                         itertools.starmap(edge_element, graph.edges(data=weight))):
+            while True:
+                chunk = list(itertools.islice(elements, chunk_size))
+                if not chunk:
+                    break
+                stream.writelines(chunk)
+        stream.write('  </graph>\n</graphml>\n')
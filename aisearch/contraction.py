@@ -0,0 +1,258 @@
+# Contraction-hierarchy index for exact shortest-path queries on undirected
+# weighted graphs. Nodes are contracted one at a time in order of importance;
+# shortcut edges preserve shortest distances between the remaining nodes. A
+# query then runs two small Dijkstra searches that only climb to higher-ranked
+# nodes and meet in the middle.
+import heapq
+import json
+
+import numpy as np
+
+from aisearch.csr import CSRGraph, name_array
+
+
+class ContractionHierarchy:
+    def __init__(self, names, rank, up_indptr, up_indices, up_weights, up_middle, version=None):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.rank = np.asarray(rank, dtype=np.int64)
+        self.up_indptr = np.asarray(up_indptr, dtype=np.int64)
+        self.up_indices = np.asarray(up_indices, dtype=np.int64)
+        self.up_weights = np.asarray(up_weights, dtype=np.float64)
+        self.up_middle = np.asarray(up_middle, dtype=np.int64)  # -1 for original edges
+        self.version = version
+
+        # Python-list copies for the query loops, and the middle node of each shortcut
+        self._indptr = self.up_indptr.tolist()
+        self._indices = self.up_indices.tolist()
+        self._weights = self.up_weights.tolist()
+        self._middle = {}
+        for u in range(len(self.names)):
+            for i in range(self._indptr[u], self._indptr[u + 1]):
+                if self.up_middle[i] >= 0:
+                    self._middle[(u, self._indices[i])] = int(self.up_middle[i])
+
+    # Build the hierarchy for `graph` (networkx or CSRGraph). `version` tags the
+    # index with the graph version it was built from; `witness_limit` caps the
+    # nodes settled by each witness search while contracting.
+    @classmethod
+    def build(cls, graph, version=None, witness_limit=100):
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+        if csr.directed:
+            raise ValueError("Contraction hierarchies are only built for undirected graphs")
+        num_nodes = len(csr)
+        inf = float('inf')
+
+        # Working adjacency between uncontracted nodes: cheapest edge per pair
+        adjacency = [{} for _ in range(num_nodes)]
+        for u in range(num_nodes):
+            for v, weight in csr.weighted_neighbors(u):
+                if u != v and weight < adjacency[u].get(v, inf):
+                    adjacency[u][v] = weight
+        middle = {}  # (lower ID, higher ID) -> contracted node a shortcut bypasses
+        upward = [None] * num_nodes  # Edges of each node at the time it was contracted
+        depth = [0] * num_nodes  # Contracted-neighbor depth, spreads contraction evenly
+
+        # Local Dijkstra from `source` that avoids `excluded`, ignoring paths
+        # longer than `max_distance` and stopping once every target is settled;
+        # returns distances and parents
+        def witness_distances(source, excluded, max_distance, targets):
+            distances = {source: 0.0}
+            parents = {source: None}
+            queue = [(0.0, source)]
+            settled = 0
+            remaining = len(targets)
+            while queue and settled < witness_limit:
+                distance, node = heapq.heappop(queue)
+                if distance > distances[node]:
+                    continue
+                settled += 1
+                if node in targets:
+                    remaining -= 1
+                    if remaining == 0:
+                        break
+                for neighbor, weight in adjacency[node].items():
+                    new_distance = distance + weight
+                    # Paths longer than the longest detour cannot be witnesses
+                    if new_distance <= max_distance and new_distance < distances.get(neighbor, inf) and neighbor != excluded:
+                        distances[neighbor] = new_distance
+                        parents[neighbor] = node
+                        heapq.heappush(queue, (new_distance, neighbor))
+            return distances, parents
+
+        # Shortcuts needed if `node` were contracted now, and the inner nodes
+        # of the witness paths that make the other shortcuts unnecessary
+        def shortcuts_for(node):
+            neighbors = list(adjacency[node].items())
+            shortcuts = []
+            witnesses = set()
+            for i, (u, weight_u) in enumerate(neighbors):
+                # A direct edge no longer than the path through `node` is a witness already
+                edges = adjacency[u]
+                targets = {x: weight_u + weight_x for x, weight_x in neighbors[i + 1:]
+                           if edges.get(x, inf) > weight_u + weight_x}
+                if not targets:
+                    continue
+                distances, parents = witness_distances(u, node, max(targets.values()), targets)
+                for x, distance in targets.items():
+                    if distances.get(x, inf) > distance:
+                        shortcuts.append((u, x, distance))
+                    else:
+                        inner = parents[x]
+                        while inner != u:
+                            witnesses.add(inner)
+                            inner = parents[inner]
+            return shortcuts, witnesses
+
+        def priority(node):
+            shortcuts, witnesses = shortcuts_for(node)
+            return len(shortcuts) - len(adjacency[node]) + depth[node], shortcuts, witnesses
+
+        # Contract nodes in order of priority. A node's priority and shortcuts
+        # are only recomputed when it is popped after a change that can affect
+        # them: a neighbor was contracted (its edges and depth changed), or a
+        # node on one of its witness paths was. Otherwise its edges and
+        # witness paths are still there (edges between remaining nodes only
+        # get cheaper), so the shortcuts computed earlier are reused.
+        priorities = [priority(node) for node in range(num_nodes)]
+        queue = [(value, node) for node, (value, _, _) in enumerate(priorities)]
+        heapq.heapify(queue)
+        changed = [False] * num_nodes
+        rank = [0] * num_nodes
+        order = 0
+        while queue:
+            value, node = heapq.heappop(queue)
+            if upward[node] is not None or value != priorities[node][0]:
+                continue  # Already contracted, or a stale entry
+            if changed[node] or any(upward[inner] is not None for inner in priorities[node][2]):
+                priorities[node] = priority(node)
+                changed[node] = False
+                if queue and priorities[node][0] > queue[0][0]:
+                    heapq.heappush(queue, (priorities[node][0], node))
+                    continue
+            shortcuts = priorities[node][1]
+
+            rank[node] = order
+            order += 1
+            # Remaining neighbors are all contracted later, so these edges go upward
+            upward[node] = adjacency[node]
+            adjacency[node] = {}
+            for u in upward[node]:
+                del adjacency[u][node]
+                depth[u] = max(depth[u], depth[node] + 1)
+                changed[u] = True
+            for u, x, distance in shortcuts:
+                if distance < adjacency[u].get(x, inf):
+                    adjacency[u][x] = adjacency[x][u] = distance
+                    middle[(min(u, x), max(u, x))] = node
+
+        # Upward graph in CSR form
+        up_indptr = [0]
+        up_indices, up_weights, up_middle = [], [], []
+        for u in range(num_nodes):
+            for v, weight in upward[u].items():
+                up_indices.append(v)
+                up_weights.append(weight)
+                up_middle.append(middle.get((min(u, v), max(u, v)), -1))
+            up_indptr.append(len(up_indices))
+
+        return cls(csr.names, rank, up_indptr, up_indices, up_weights, up_middle, version)
+
+    def __len__(self):
+        return len(self.names)
+
+    def number_of_shortcuts(self):
+        return int((self.up_middle >= 0).sum())
+
+    # Whether the index no longer matches the graph at `version`
+    def is_stale(self, version):
+        return version != self.version
+
+    # Shortest path and its cost between two node names, or (None, inf)
+    def query(self, start, goal):
+        source, target = self.ids[start], self.ids[goal]
+        if source == target:
+            return [start], 0
+
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        distances = ({source: 0.0}, {target: 0.0})
+        parents = ({source: None}, {target: None})
+        queues = ([(0.0, source)], [(0.0, target)])
+        best, meeting = float('inf'), None
+
+        while queues[0] or queues[1]:
+            # Expand the side with the smaller tentative distance
+            if not queues[1] or (queues[0] and queues[0][0][0] <= queues[1][0][0]):
+                side = 0
+            else:
+                side = 1
+            distance, node = heapq.heappop(queues[side])
+            if distance >= best:
+                # Nothing on this side can improve the meeting any more
+                queues[side].clear()
+                continue
+            if distance > distances[side][node]:
+                continue
+
+            other = distances[1 - side].get(node)
+            if other is not None and distance + other < best:
+                best, meeting = distance + other, node
+
+            for i in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[i]
+                new_distance = distance + weights[i]
+                if new_distance < distances[side].get(neighbor, float('inf')):
+                    distances[side][neighbor] = new_distance
+                    parents[side][neighbor] = node
+                    heapq.heappush(queues[side], (new_distance, neighbor))
+
+        if meeting is None:
+            return None, float('inf')
+
+        # Hierarchy path start -> meeting -> goal, then expand the shortcuts on it
+        hops = []
+        node = meeting
+        while node is not None:
+            hops.append(node)
+            node = parents[0][node]
+        hops.reverse()
+        node = parents[1][meeting]
+        while node is not None:
+            hops.append(node)
+            node = parents[1][node]
+
+        path = [hops[0]]
+        for u, v in zip(hops, hops[1:]):
+            path.extend(self._unpack(u, v))
+        return [self.names[i] for i in path], best
+
+    def shortest_path(self, start, goal):
+        return self.query(start, goal)[0]
+
+    # Original nodes after `u` on the shortest path u -> v
+    def _unpack(self, u, v):
+        nodes = []
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            key = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+            bypassed = self._middle.get(key)
+            if bypassed is None:
+                nodes.append(b)
+            else:
+                stack.append((bypassed, b))
+                stack.append((a, bypassed))
+        return nodes
+
+    # Save the index to an .npz file; node names must be str or int
+    def save(self, path):
+        np.savez(path, names=name_array(self.names), rank=self.rank,
+                 up_indptr=self.up_indptr, up_indices=self.up_indices,
+                 up_weights=self.up_weights, up_middle=self.up_middle,
+                 version=np.array(json.dumps(self.version)))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['names'].tolist(), data['rank'], data['up_indptr'], data['up_indices'],
+                       data['up_weights'], data['up_middle'], json.loads(data['version'].item()))
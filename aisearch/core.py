@@ -0,0 +1,284 @@
+# Shared search core: frontiers hold node IDs only, predecessors live in one
+# parent map, and the path is rebuilt once when the goal is reached.
+import heapq
+from itertools import count
+
+import networkx as nx
+
+from aisearch.heap import make_queue
+
+
+# Rebuild the path ending at `node` by following a parent map back to the root
+# (the root is the node whose parent is None)
+def reconstruct_path(parents, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+# Search tree for algorithms that branch over paths rather than nodes
+# (e.g. branch and bound), where the same node may appear on many partial paths.
+# Each entry is an integer handle; only (node, parent handle) is stored per entry.
+# Entries are reference counted (a queue entry or a child each hold one): once
+# nothing refers to an entry it is released and its slot reused, so the tree
+# only holds the live frontier and its ancestors.
+class PathTree:
+    def __init__(self):
+        self.nodes = []
+        self.parents = []
+        self.refs = []
+        self.free = []  # Released handles, reused by add()
+
+    # Add `node` as a child of the entry `parent` (None for the root), return its
+    # handle. The new entry starts with one reference, for the caller.
+    def add(self, node, parent=None):
+        if parent is not None:
+            self.refs[parent] += 1
+        if self.free:
+            handle = self.free.pop()
+            self.nodes[handle] = node
+            self.parents[handle] = parent
+            self.refs[handle] = 1
+            return handle
+        self.nodes.append(node)
+        self.parents.append(parent)
+        self.refs.append(1)
+        return len(self.nodes) - 1
+
+    # Take another reference to entry `handle` (e.g. to keep the best path so far)
+    def retain(self, handle):
+        self.refs[handle] += 1
+
+    # Drop a reference to entry `handle`; entries left without references are
+    # released, and so are their ancestors in turn
+    def release(self, handle):
+        refs = self.refs
+        while handle is not None:
+            refs[handle] -= 1
+            if refs[handle]:
+                return
+            self.free.append(handle)
+            handle = self.parents[handle]
+
+    # Number of entries currently held
+    def __len__(self):
+        return len(self.nodes) - len(self.free)
+
+    # Check whether `node` lies on the path ending at entry `handle`
+    def on_path(self, handle, node):
+        nodes = self.nodes
+        parents = self.parents
+        while handle is not None:
+            if nodes[handle] == node:
+                return True
+            handle = parents[handle]
+        return False
+
+    # Rebuild the path ending at entry `handle`
+    def path(self, handle):
+        path = []
+        nodes = self.nodes
+        parents = self.parents
+        while handle is not None:
+            path.append(nodes[handle])
+            handle = parents[handle]
+        path.reverse()
+        return path
+
+
+# Heap item for a PathTree entry that orders like the path list it stands for,
+# so queues keyed (cost, node, PathKey) break ties exactly as (cost, node, path)
+# did. Paths are only rebuilt when cost and node are equal.
+class PathKey:
+    __slots__ = ('tree', 'handle')
+
+    def __init__(self, tree, handle):
+        self.tree = tree
+        self.handle = handle
+
+    def __lt__(self, other):
+        return self.tree.path(self.handle) < other.tree.path(other.handle)
+
+
+# Marker for "no entry yet" in node maps (None is reserved for the root's parent)
+UNSEEN = object()
+
+
+# Dict-backed node map for graphs keyed by arbitrary node names: reading a
+# missing key returns `fill` without inserting it, like an array pre-filled with it
+class NodeMap(dict):
+    def __init__(self, fill):
+        super().__init__()
+        self.fill = fill
+
+    def __missing__(self, key):
+        return self.fill
+
+
+# Adapter giving a networkx graph the same search interface as CSRGraph.
+# Node IDs are simply the node names, so no translation is needed.
+class NetworkXView:
+    def __init__(self, graph, weight='weight'):
+        self.graph = graph
+        self.weight = weight
+        self._adj = graph.adj
+
+    def id_of(self, node):
+        return node
+
+    def name_of(self, node):
+        return node
+
+    def to_names(self, ids):
+        return list(ids)
+
+    def neighbors(self, node):
+        return self._adj[node]
+
+    def weighted_neighbors(self, node):
+        weight = self.weight
+        return [(neighbor, data[weight]) for neighbor, data in self._adj[node].items()]
+
+    def node_map(self, fill):
+        return NodeMap(fill)
+
+    # The same graph with every edge reversed
+    def reversed(self):
+        if not self.graph.is_directed():
+            return self
+        return NetworkXView(self.graph.reverse(copy=False), self.weight)
+
+    # Per-node values (heuristics, scores) indexed by node ID
+    def node_values(self, values):
+        return values
+
+
+# Return the search interface for `graph`: networkx graphs are wrapped,
+# graphs that already implement it (e.g. CSRGraph) are returned as-is
+def search_view(graph):
+    if isinstance(graph, nx.Graph):
+        return NetworkXView(graph)
+    return graph
+
+
+# Best-first search keyed by node: one live queue entry per node with decrease-key
+# (`queue` is 'lazy' or 'indexed', see aisearch.heap), a parent map instead of
+# per-entry paths, and a closed set. Entries are ordered by (g + h, g), so with
+# h = 0 this is Dijkstra and with a heuristic it is A*; closed nodes are not
+# reopened and the search stops at the first goal pop.
+#
+# With exhaustive=True it runs as branch and bound instead: reaching the goal
+# only sets the incumbent (bound), entries whose cost reaches the bound are
+# pruned, and nodes are reopened whenever a cheaper path to them turns up, so
+# the result is optimal even for an inadmissible heuristic.
+#
+# A `weight` above 1 inflates the heuristic (weighted A*, g + weight * h): fewer
+# nodes are expanded and, for a consistent heuristic, the cost found is at most
+# `weight` times the optimum.
+#
+# Works on node IDs of `view`; returns (path IDs, cost) or (None, inf). If
+# given, `stats` receives 'settled' (expansions) plus the queue counters.
+def best_first_search(view, start, goal, heuristics, queue='lazy', stats=None, exhaustive=False, weight=1.0):
+    frontier = make_queue(queue)
+    inf = float('inf')
+    costs = view.node_map(inf)
+    parents = view.node_map(UNSEEN)
+    closed = view.node_map(False)
+    costs[start] = 0
+    parents[start] = None
+    frontier.push(start, (weight * heuristics[start], 0))
+    settled = 0
+    best_path, best_cost = None, inf
+
+    while frontier:
+        node, (_, cost) = frontier.pop()
+        if node == goal:
+            if cost < best_cost:
+                best_path, best_cost = reconstruct_path(parents, goal), cost
+            if not exhaustive:
+                break
+        if cost >= best_cost:
+            continue  # Bound
+        closed[node] = True
+        settled += 1
+
+        for neighbor, edge_weight in view.weighted_neighbors(node):
+            if closed[neighbor] and not exhaustive:
+                continue
+            new_cost = cost + edge_weight
+            if new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                parents[neighbor] = node
+                frontier.push(neighbor, (new_cost + weight * heuristics[neighbor], new_cost))
+
+    if stats is not None:
+        stats['settled'] = settled
+        stats.update(frontier.stats())
+    return best_path, best_cost
+
+
+# Focal search (A*-epsilon): OPEN is ordered by f = g + h as in A*, but the node
+# expanded next is the one closest to the goal (smallest h) among the FOCAL
+# list, the open nodes with f <= `weight` * min f. The goal is accepted from
+# FOCAL, so for an admissible heuristic its cost is at most `weight` times the
+# optimum. Nodes are reopened when a cheaper path to them turns up.
+#
+# Three heaps with lazy deletion: `open_f` tracks min f, `pending` holds open
+# nodes not yet admitted to FOCAL (by f), and `focal` orders admitted ones by h.
+# Returns (path IDs, cost) or (None, inf); `stats` receives 'settled',
+# 'stale_pops' and 'max_queue'.
+def focal_search(view, start, goal, heuristics, weight, stats=None):
+    inf = float('inf')
+    costs = view.node_map(inf)
+    parents = view.node_map(UNSEEN)
+    closed = view.node_map(False)
+    costs[start] = 0
+    parents[start] = None
+    sequence = count()
+    entry = (heuristics[start], 0, next(sequence), start)  # (f, g, sequence, node)
+    open_f, pending, focal = [entry], [entry], []
+    settled = stale_pops = max_queue = 0
+    best_path, best_cost = None, inf
+
+    while True:
+        # Drop entries made stale by a cheaper path or by expansion
+        while open_f and (closed[open_f[0][3]] or open_f[0][1] != costs[open_f[0][3]]):
+            heapq.heappop(open_f)
+            stale_pops += 1
+        if not open_f:
+            break
+        bound = weight * open_f[0][0]
+        while pending and pending[0][0] <= bound:
+            f, cost, seq, node = heapq.heappop(pending)
+            if cost == costs[node] and not closed[node]:
+                heapq.heappush(focal, (heuristics[node], f, cost, seq, node))
+        _, f, cost, _, node = heapq.heappop(focal)
+        if closed[node] or cost != costs[node]:
+            stale_pops += 1
+            continue
+        closed[node] = True
+        if node == goal:
+            # Ancestors may have been reached more cheaply since the goal's
+            # entry was made, so the path is costed as rebuilt
+            best_path = reconstruct_path(parents, goal)
+            best_cost = sum(dict(view.weighted_neighbors(u))[v] for u, v in zip(best_path, best_path[1:]))
+            break
+        settled += 1
+
+        for neighbor, edge_weight in view.weighted_neighbors(node):
+            new_cost = cost + edge_weight
+            if new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                parents[neighbor] = node
+                closed[neighbor] = False  # Reopen
+                entry = (new_cost + heuristics[neighbor], new_cost, next(sequence), neighbor)
+                heapq.heappush(open_f, entry)
+                heapq.heappush(pending, entry)
+        max_queue = max(max_queue, len(open_f))
+
+    if stats is not None:
+        stats.update(settled=settled, stale_pops=stale_pops, max_queue=max_queue)
+    return best_path, best_cost
@@ -0,0 +1,280 @@
+# Frozen compressed-sparse-row graph: integer node IDs, NumPy adjacency arrays
+# and a name <-> ID interning table. Neighbors of node u are
+# indices[indptr[u]:indptr[u + 1]] with matching weights.
+#
+# Graphs can be saved to a versioned binary file and loaded back through a
+# read-only memory map: arrays and name tables are used in place, so opening
+# is instant and processes that load the same file share its pages.
+import bisect
+import json
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+FILE_MAGIC = b'AISGRAPH'
+FILE_VERSION = 1
+FILE_ALIGNMENT = 64
+
+
+class CSRGraph:
+    def __init__(self, indptr, indices, weights, names, directed=False, node_data=None):
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(indptr) != len(names) + 1 or len(indices) != len(weights) or indptr[-1] != len(indices):
+            raise ValueError("indptr, indices, weights and names do not describe the same graph")
+        for array in (indptr, indices, weights):
+            array.flags.writeable = False
+
+        set_ = object.__setattr__
+        set_(self, 'indptr', indptr)
+        set_(self, 'indices', indices)
+        set_(self, 'weights', weights)
+        if isinstance(names, NameTable):
+            set_(self, 'names', names)
+            set_(self, 'ids', names.ids)
+        else:
+            set_(self, 'names', list(names))
+            set_(self, 'ids', {name: i for i, name in enumerate(self.names)})
+        set_(self, 'directed', directed)
+        set_(self, 'node_data', dict(node_data or {}))  # Per-node arrays by ID, e.g. heuristics
+        set_(self, '_lists', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph is frozen")
+
+    # Build from a networkx graph; undirected edges are stored in both directions.
+    # Neighbor order follows the networkx adjacency order, so searches visit
+    # nodes in the same order as on the original graph.
+    @classmethod
+    def from_networkx(cls, graph, weight='weight', default_weight=1.0):
+        names = list(graph.nodes)
+        ids = {name: i for i, name in enumerate(names)}
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        indices = []
+        weights = []
+        for i, (node, neighbors) in enumerate(graph.adj.items()):
+            for neighbor, data in neighbors.items():
+                indices.append(ids[neighbor])
+                weights.append(data.get(weight, default_weight))
+            indptr[i + 1] = len(indices)
+        return cls(indptr, indices, weights, names, directed=graph.is_directed())
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def number_of_nodes(self):
+        return len(self.names)
+
+    def number_of_edges(self):
+        edges = len(self.indices)
+        return edges if self.directed else edges // 2
+
+    def id_of(self, name):
+        return self.ids[name]
+
+    def name_of(self, node):
+        return self.names[node]
+
+    def to_names(self, ids):
+        names = self.names
+        return [names[i] for i in ids]
+
+    # Python-list copies of the arrays: scalar indexing into NumPy arrays is
+    # slow, so the per-node search loops read these instead (memory-mapped
+    # graphs use memoryviews of the mapping, which index almost as fast)
+    def _adjacency_lists(self):
+        if self._lists is None:
+            object.__setattr__(self, '_lists', (self.indptr.tolist(), self.indices.tolist(), self.weights.tolist()))
+        return self._lists
+
+    def neighbors(self, node):
+        indptr, indices, _ = self._adjacency_lists()
+        return indices[indptr[node]:indptr[node + 1]]
+
+    def weighted_neighbors(self, node):
+        indptr, indices, weights = self._adjacency_lists()
+        start, end = indptr[node], indptr[node + 1]
+        return zip(indices[start:end], weights[start:end])
+
+    def node_map(self, fill):
+        return [fill] * len(self.names)
+
+    # Per-node values (heuristics, scores) indexed by node ID; accepts either a
+    # {name: value} mapping (missing names become None) or a sequence already
+    # ordered by ID
+    def node_values(self, values):
+        if hasattr(values, 'keys'):
+            return [values.get(name) for name in self.names]
+        return values
+
+    # The same graph with every edge reversed (undirected graphs are returned as-is)
+    def reversed(self):
+        if not self.directed:
+            return self
+        sources = np.repeat(np.arange(len(self.names)), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(len(self.names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=len(self.names)), out=indptr[1:])
+        return CSRGraph(indptr, sources[order], self.weights[order], self.names, directed=True)
+
+    # Write the graph to `path` in the binary graph format, with `node_data`
+    # ({label: {name: value} or sequence by ID}, e.g. heuristics) stored as
+    # float arrays (NaN where a node has no value). The file is written next to
+    # `path` and renamed over it, so processes that have the old file mapped
+    # keep reading the old version.
+    def save(self, path, node_data=None):
+        arrays = {'indptr': self.indptr.astype('<i8'), 'indices': self.indices.astype('<i4'),
+                  'weights': self.weights.astype('<f8')}
+        names = list(self.names)
+        if all(isinstance(name, str) for name in names):
+            name_kind = 'str'
+            encoded = [name.encode('utf-8') for name in names]
+            arrays['name_offsets'] = np.concatenate([[0], np.cumsum([len(name) for name in encoded])]).astype('<i8')
+            arrays['name_bytes'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            arrays['name_order'] = np.array(sorted(range(len(names)), key=encoded.__getitem__), dtype='<i4')
+        elif all(isinstance(name, int) and not isinstance(name, bool) for name in names):
+            name_kind = 'int'
+            arrays['name_values'] = np.array(names, dtype='<i8')
+            arrays['name_order'] = np.argsort(arrays['name_values'], kind='stable').astype('<i4')
+        else:
+            raise ValueError("Only graphs with str or int node names can be saved; relabel the nodes first")
+        data = {**self.node_data, **(node_data or {})}
+        for label, values in data.items():
+            values = self.node_values(values)
+            arrays['data:' + label] = np.array([np.nan if value is None else value for value in values], dtype='<f8')
+
+        layout, offset = {}, 0
+        for key, array in arrays.items():
+            layout[key] = [offset, array.dtype.str, len(array)]
+            offset += -(-array.nbytes // FILE_ALIGNMENT) * FILE_ALIGNMENT
+        header = json.dumps({'directed': self.directed, 'names': name_kind, 'arrays': layout}).encode('utf-8')
+        start = -(-(len(FILE_MAGIC) + 8 + len(header)) // FILE_ALIGNMENT) * FILE_ALIGNMENT
+
+        temporary = f'{path}.tmp{os.getpid()}'
+        with open(temporary, 'wb') as file:
+            file.write(FILE_MAGIC + np.array([FILE_VERSION, len(header)], dtype='<u4').tobytes() + header)
+            for key, array in arrays.items():
+                file.seek(start + layout[key][0])
+                file.write(np.ascontiguousarray(array).tobytes())
+            file.truncate(start + offset)
+        os.replace(temporary, path)
+
+    # Open a graph written by save(). Nothing is copied: the arrays, the
+    # node_data arrays and (for str and int names) the name table are views of
+    # one read-only np.memmap of the file.
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            prefix = file.read(len(FILE_MAGIC) + 8)
+            if prefix[:len(FILE_MAGIC)] != FILE_MAGIC:
+                raise ValueError(f"{path} is not a graph file")
+            version, header_length = np.frombuffer(prefix[len(FILE_MAGIC):], dtype='<u4').tolist()
+            if version > FILE_VERSION:
+                raise ValueError(f"{path} uses graph format version {version}; this version reads up to {FILE_VERSION}")
+            header = json.loads(file.read(header_length).decode('utf-8'))
+        start = -(-(len(FILE_MAGIC) + 8 + header_length) // FILE_ALIGNMENT) * FILE_ALIGNMENT
+
+        mapping = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays = {}
+        for key, (offset, dtype, length) in header['arrays'].items():
+            dtype = np.dtype(dtype)
+            arrays[key] = mapping[start + offset:start + offset + length * dtype.itemsize].view(dtype)
+
+        if header['names'] == 'str':
+            names = NameTable(arrays['name_order'], offsets=arrays['name_offsets'], blob=arrays['name_bytes'])
+        elif header['names'] == 'int':
+            names = NameTable(arrays['name_order'], values=arrays['name_values'])
+        else:
+            # Older files pickled other names; unpickling can run arbitrary code
+            raise ValueError(f"{path} stores {header['names']!r} node names; only str and int names are loaded")
+        node_data = {key[len('data:'):]: array for key, array in arrays.items() if key.startswith('data:')}
+        graph = cls(arrays['indptr'], arrays['indices'], arrays['weights'], names,
+                    directed=header['directed'], node_data=node_data)
+        object.__setattr__(graph, '_lists', (memoryview(graph.indptr), memoryview(graph.indices),
+                                             memoryview(graph.weights)))
+        return graph
+
+
+# Node names as a NumPy array for .npz files (Landmarks, ContractionHierarchy).
+# Only str and int names are stored, so the files load without pickle.
+def name_array(names):
+    names = list(names)
+    if all(isinstance(name, str) for name in names):
+        return np.array(names, dtype=str)
+    if all(isinstance(name, int) and not isinstance(name, bool) for name in names):
+        return np.array(names, dtype=np.int64)
+    raise ValueError("Only graphs with str or int node names can be saved; relabel the nodes first")
+
+
+# Read-only node-name table over memory-mapped arrays: names are decoded on
+# access, and name -> ID lookups binary-search `order` (IDs sorted by name)
+# instead of building a dict. Holds either UTF-8 names (`offsets` into
+# `blob`) or integer names (`values`).
+class NameTable(Sequence):
+    def __init__(self, order, offsets=None, blob=None, values=None):
+        self.order = order
+        self.offsets = offsets
+        self.blob = blob
+        self.values = values
+        self.ids = _NameIndex(self)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, node):
+        if self.values is not None:
+            return int(self.values[node])
+        return self.blob[self.offsets[node]:self.offsets[node + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        if self.values is not None:
+            return iter(self.values.tolist())
+        blob, offsets = self.blob.tobytes(), self.offsets.tolist()
+        return (blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:]))
+
+    def __contains__(self, name):
+        return self.find(name) >= 0
+
+    # ID of `name`, or -1
+    def find(self, name):
+        if self.values is not None:
+            if not isinstance(name, int):
+                return -1
+            key, probe = name, self.values.__getitem__
+        elif isinstance(name, str):
+            key, probe = name.encode('utf-8'), self._encoded
+        else:
+            return -1
+        order = self.order
+        i = bisect.bisect_left(range(len(order)), key, key=lambda i: probe(order[i]))
+        return int(order[i]) if i < len(order) and probe(order[i]) == key else -1
+
+    def _encoded(self, node):
+        return self.blob[self.offsets[node]:self.offsets[node + 1]].tobytes()
+
+
+# The name -> ID mapping of a NameTable (CSRGraph.ids)
+class _NameIndex:
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, name):
+        node = self.table.find(name)
+        if node < 0:
+            raise KeyError(name)
+        return node
+
+    def __contains__(self, name):
+        return self.table.find(name) >= 0
+
+    def get(self, name, default=None):
+        node = self.table.find(name)
+        return default if node < 0 else node
+
+    def __len__(self):
+        return len(self.table)
@@ -0,0 +1,165 @@
+# Priority queues for the best-first searches, both with decrease-key.
+# IndexedHeap lowers a priority in place, so it holds at most one entry per
+# node (O(V) entries). LazyHeap pushes a new entry instead and skips the
+# outdated one when it surfaces, so it can hold one entry per edge relaxation
+# (O(E) entries). LazyHeap is the searches' default because heapq runs in C and
+# is faster in practice. IndexedHeap is the choice when queue memory matters.
+import heapq
+from itertools import count
+
+
+# Binary heap with a position map, so a key's priority can be lowered in place.
+# Equal priorities pop in insertion order.
+class IndexedHeap:
+    def __init__(self):
+        self._heap = []  # [priority, sequence, key]; sequence is unique, so keys are never compared
+        self._position = {}  # key -> index in _heap
+        self._sequence = count()
+        self.pushes = 0
+        self.decreases = 0
+        self.pops = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, key):
+        return key in self._position
+
+    def priority(self, key):
+        return self._heap[self._position[key]][0]
+
+    # Insert `key`, or lower its priority if it is already queued.
+    # Returns False if the key is queued with an equal or better priority.
+    def push(self, key, priority):
+        index = self._position.get(key)
+        if index is None:
+            self._heap.append([priority, next(self._sequence), key])
+            self._position[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            self.pushes += 1
+            self.max_size = max(self.max_size, len(self._heap))
+            return True
+        if priority >= self._heap[index][0]:
+            return False
+        self._heap[index][0] = priority
+        self._sift_up(index)
+        self.decreases += 1
+        return True
+
+    # Remove and return (key, priority) with the smallest priority
+    def pop(self):
+        heap = self._heap
+        priority, _, key = heap[0]
+        last = heap.pop()
+        del self._position[key]
+        if heap:
+            heap[0] = last
+            self._position[last[2]] = 0
+            self._sift_down(0)
+        self.pops += 1
+        return key, priority
+
+    def peek(self):
+        return self._heap[0][2], self._heap[0][0]
+
+    def stats(self):
+        return {'pushes': self.pushes, 'decreases': self.decreases, 'pops': self.pops,
+                'stale_pops': 0, 'max_queue': self.max_size}
+
+    def _sift_up(self, index):
+        heap, position = self._heap, self._position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[index] = heap[parent]
+            position[heap[index][2]] = index
+            index = parent
+        heap[index] = entry
+        position[entry[2]] = index
+
+    def _sift_down(self, index):
+        heap, position = self._heap, self._position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[index] = heap[child]
+            position[heap[index][2]] = index
+            index = child
+        heap[index] = entry
+        position[entry[2]] = index
+
+
+# heapq-based queue with lazy deletion: an improved priority is pushed as a
+# new entry and the outdated one is skipped (and counted) when it surfaces
+class LazyHeap:
+    def __init__(self):
+        self._heap = []  # (priority, sequence, key)
+        self._priority = {}  # key -> current priority of its live entry
+        self._sequence = count()
+        self.pushes = 0
+        self.decreases = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self._priority)
+
+    def __contains__(self, key):
+        return key in self._priority
+
+    def priority(self, key):
+        return self._priority[key]
+
+    def push(self, key, priority):
+        current = self._priority.get(key)
+        if current is not None:
+            if priority >= current:
+                return False
+            self.decreases += 1
+        else:
+            self.pushes += 1
+        self._priority[key] = priority
+        heapq.heappush(self._heap, (priority, next(self._sequence), key))
+        self.max_size = max(self.max_size, len(self._heap))
+        return True
+
+    def pop(self):
+        while True:
+            priority, _, key = heapq.heappop(self._heap)
+            if self._priority.get(key) == priority:
+                del self._priority[key]
+                self.pops += 1
+                return key, priority
+            self.stale_pops += 1
+
+    def peek(self):
+        while True:
+            priority, _, key = self._heap[0]
+            if self._priority.get(key) == priority:
+                return key, priority
+            heapq.heappop(self._heap)
+            self.stale_pops += 1
+
+    def stats(self):
+        return {'pushes': self.pushes, 'decreases': self.decreases, 'pops': self.pops,
+                'stale_pops': self.stale_pops, 'max_queue': self.max_size}
+
+
+# Create the queue named by `kind`: 'indexed' or 'lazy'
+def make_queue(kind):
+    if kind == 'indexed':
+        return IndexedHeap()
+    if kind == 'lazy':
+        return LazyHeap()
+    raise ValueError(f"Unknown queue: {kind}")
@@ -0,0 +1,127 @@
+# Computed heuristics for the informed searches. A provider estimates h with
+# NumPy for the whole graph at once (or, on very large graphs, for batches of
+# nodes as the search reaches them), and keeps the estimates per goal, so
+# repeated queries to the same goal reuse them.
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+
+from aisearch.core import NetworkXView
+
+FULL_TABLE_WORK = 1 << 22  # Largest nodes x per-node work estimated up front for a goal
+
+
+# Per-goal estimates filled in as the search looks nodes up, for graphs too
+# large to estimate up front. The first lookup of a node estimates it together
+# with its neighbors (what the search looks up when it expands the node) in one
+# vectorized call. Without `neighbors` (implicit graphs) nodes are estimated
+# one at a time.
+class _LazyTable(dict):
+    def __init__(self, estimate, neighbors=None):
+        super().__init__()
+        self.estimate = estimate
+        self.neighbors = neighbors
+
+    def __missing__(self, node):
+        nodes = [node]
+        if self.neighbors is not None:
+            nodes.extend(neighbor for neighbor in self.neighbors(node) if neighbor not in self and neighbor != node)
+        self.update(zip(nodes, self.estimate(nodes).tolist()))
+        return dict.__getitem__(self, node)
+
+
+# Base class for heuristic providers. Subclasses implement estimate(), which
+# returns h(node -> goal) for an array of node IDs.
+class HeuristicProvider:
+    def __init__(self, max_cached_goals=8):
+        self.max_cached_goals = max_cached_goals
+        self._tables = OrderedDict()  # (graph id, goal) -> (graph, table)
+
+    def estimate(self, view, nodes, goal):
+        raise NotImplementedError
+
+    # Relative cost of estimating one node (array elements touched), used to
+    # decide whether a whole table is cheap enough to build up front
+    def node_work(self, view):
+        return 1
+
+    # Node-ID-indexed estimates towards `goal`. When nodes x node_work() is
+    # within FULL_TABLE_WORK, every node is estimated in one vectorized call;
+    # larger graphs and implicit graphs are estimated lazily (see _LazyTable).
+    # Tables are kept per goal for graphs that cannot change (CSR, implicit and
+    # frozen networkx graphs); a networkx graph that may be edited gets a new
+    # table for every query.
+    def table(self, view, goal):
+        graph = getattr(view, 'graph', view)
+        cacheable = not isinstance(graph, nx.Graph) or nx.is_frozen(graph)
+        key = (id(graph), goal)
+        cached = self._tables.get(key) if cacheable else None
+        if cached is not None and cached[0] is graph:
+            self._tables.move_to_end(key)
+            return cached[1]
+
+        def estimate(nodes):
+            return self.estimate(view, nodes, goal)
+
+        if hasattr(view, 'names'):
+            nodes = range(len(view.names))
+        elif isinstance(view, NetworkXView):
+            nodes = view.graph
+        else:
+            nodes = None
+        if nodes is not None and len(nodes) * self.node_work(view) <= FULL_TABLE_WORK:
+            if hasattr(view, 'names'):
+                table = estimate(nodes).tolist()
+            else:
+                nodes = list(nodes)
+                table = dict(zip(nodes, estimate(nodes).tolist()))
+        else:
+            table = _LazyTable(estimate, view.neighbors if nodes is not None else None)
+        if cacheable:
+            self._tables[key] = (graph, table)
+            if len(self._tables) > self.max_cached_goals:
+                self._tables.popitem(last=False)
+        return table
+
+    def clear(self):
+        self._tables.clear()
+
+
+# Straight-line distance between node coordinates: 'euclidean' or 'manhattan'.
+# `coords` is a {node: (x, y, ...)} mapping or, for CSR graphs, an array of
+# shape (num_nodes, dims) in node-ID order. The estimate is multiplied by
+# `scale`; it is admissible when no edge is cheaper than scale * its length.
+class CoordinateHeuristic(HeuristicProvider):
+    def __init__(self, coords, metric='euclidean', scale=1.0, max_cached_goals=8):
+        super().__init__(max_cached_goals)
+        if metric not in ('euclidean', 'manhattan'):
+            raise ValueError(f"Unknown metric: {metric}")
+        self.coords = coords
+        self.metric = metric
+        self.scale = scale
+        self._points = None  # (graph, coordinate array in node-ID order)
+
+    def _points_of(self, view, nodes):
+        if not hasattr(view, 'names'):
+            return np.asarray([self.coords[node] for node in nodes], dtype=np.float64)
+        if self._points is None or self._points[0] is not view:
+            points = np.asarray(view.node_values(self.coords), dtype=np.float64)
+            self._points = (view, points)
+        return self._points[1][nodes]
+
+    def estimate(self, view, nodes, goal):
+        delta = self._points_of(view, nodes) - self._points_of(view, [goal])
+        if self.metric == 'euclidean':
+            distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        else:
+            distance = np.abs(delta).sum(axis=1)
+        return distance * self.scale
+
+
+# Node-ID-indexed heuristic values towards `goal` for either a {node: h}
+# mapping or a HeuristicProvider
+def heuristic_table(view, heuristics, goal):
+    if isinstance(heuristics, HeuristicProvider):
+        return heuristics.table(view, goal)
+    return view.node_values(heuristics)
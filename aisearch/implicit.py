@@ -0,0 +1,91 @@
+# Implicit graphs: the state space is given by a successor function and states
+# are generated only when a search reaches them, never stored in a networkx graph.
+from aisearch.core import NodeMap
+
+
+# Search interface over `successors(state) -> iterable of (state, cost)`.
+# Node IDs are the states themselves, or `key(state)` for states that are not
+# hashable (or whose identity is only part of the state); states reached so far
+# are then remembered by key so they can be expanded and returned in paths.
+# `predecessors` (same signature) is needed only by searches that also run
+# backwards from the goal (bidirectional_search); for reversible moves pass the
+# successor function again.
+#
+# For game trees, successors() yields child states with any cost (ignored), and
+# minimax/alpha_beta take a `score(state)` function returning the leaf score,
+# or None for inner positions.
+class ImplicitGraph:
+    def __init__(self, successors, key=None, predecessors=None):
+        self.successor_function = successors
+        self.key = key
+        self.predecessor_function = predecessors
+        self.states = {}  # key -> state, only used with `key`
+
+    def id_of(self, state):
+        if self.key is None:
+            return state
+        node = self.key(state)
+        self.states.setdefault(node, state)
+        return node
+
+    def name_of(self, node):
+        return node if self.key is None else self.states[node]
+
+    def to_names(self, ids):
+        return [self.name_of(node) for node in ids]
+
+    def weighted_neighbors(self, node):
+        if self.key is None:
+            return list(self.successor_function(node))
+        return [(self.id_of(state), cost) for state, cost in self.successor_function(self.states[node])]
+
+    def neighbors(self, node):
+        return [neighbor for neighbor, _ in self.weighted_neighbors(node)]
+
+    # Child positions, like networkx's DiGraph.successors(), for the adversarial searches
+    def successors(self, node):
+        return self.neighbors(node)
+
+    def node_map(self, fill):
+        return NodeMap(fill)
+
+    def reversed(self):
+        if self.predecessor_function is None:
+            raise ValueError("Searching backwards needs a predecessor function")
+        graph = ImplicitGraph(self.predecessor_function, self.key, self.successor_function)
+        graph.states = self.states
+        return graph
+
+    # Per-node values (heuristics, scores): a function of the state is evaluated
+    # lazily, once per node; a mapping is used as-is (keyed like the node IDs)
+    def node_values(self, values):
+        if callable(values):
+            return StateValues(self, values)
+        return values
+
+    # Forget the states remembered by key (between searches on a large space)
+    def clear(self):
+        self.states.clear()
+
+
+# Mapping from node ID to `function(state)`, computed on first lookup. A None
+# result counts as missing, so `node in values` works as a leaf test for scores.
+class StateValues:
+    def __init__(self, graph, function):
+        self.graph = graph
+        self.function = function
+        self.values = {}
+
+    def __getitem__(self, node):
+        try:
+            return self.values[node]
+        except KeyError:
+            value = self.values[node] = self.function(self.graph.name_of(node))
+            return value
+
+    def __contains__(self, node):
+        return self[node] is not None
+
+    def get(self, node, default=None):
+        value = self[node]
+        return default if value is None else value
@@ -0,0 +1,554 @@
+# Informed search algorithms: they take per-node heuristic estimates as a mapping
+# or a HeuristicProvider (see aisearch.heuristics); on an ImplicitGraph, also as
+# a function of the state
+import heapq
+import time
+from collections import OrderedDict
+from itertools import count
+
+from aisearch.core import UNSEEN, best_first_search, focal_search, reconstruct_path, search_view
+from aisearch.heuristics import heuristic_table
+
+
+# A* search algorithm (on a networkx graph or a CSRGraph); `heuristics` is a
+# {node: estimate} mapping or a HeuristicProvider. The open list is keyed by
+# node: `queue` picks lazy deletion of stale entries ('lazy', the
+# faster default) or an indexed heap with decrease-key ('indexed', which holds
+# at most one entry per node). If given, `stats` (a dict) receives
+# the number of settled (expanded) nodes under 'settled' plus queue counters.
+#
+# With `epsilon` > 0 the search is bounded-suboptimal: the returned cost is at
+# most (1 + epsilon) times the optimum, in exchange for fewer expansions.
+# By default the heuristic is inflated by (1 + epsilon) (weighted A*, bound
+# holds for a consistent heuristic); with focal=True it runs focal search
+# (A*-epsilon), expanding the open node nearest the goal among those within
+# the bound (holds for any admissible heuristic).
+def a_star(graph, start, goal, heuristics, stats=None, queue='lazy', epsilon=0.0, focal=False):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+
+    if focal:
+        path, cost = focal_search(view, start_id, goal_id, heuristics, 1 + epsilon, stats)
+    else:
+        path, cost = best_first_search(view, start_id, goal_id, heuristics, queue, stats, weight=1 + epsilon)
+    if path is None:
+        return None, float('inf')  # If no path found
+    return view.to_names(path), cost
+
+
+# IDA*: depth-first searches bounded by f = g + h, restarted with the smallest
+# f that exceeded the bound, so memory stays proportional to the path length.
+# Cycles are cut with a set of the nodes on the current path. With
+# `max_memory_nodes`, a table of up to that many nodes (least recently used
+# evicted) remembers the cheapest g seen in the current iteration and cuts
+# paths that reach a node no more cheaply, which avoids re-expanding
+# transpositions. Optimal for an admissible heuristic. Returns (path, cost) like
+# a_star; `stats` receives 'expanded' and 'iterations'. Both memory-bounded
+# searches take `stats` in a_star's position and `max_memory_nodes` by keyword.
+def ida_star(graph, start, goal, heuristics, stats=None, *, max_memory_nodes=None):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    inf = float('inf')
+    threshold = heuristics[start_id]
+    expanded = iterations = 0
+    path = None
+
+    while path is None and threshold < inf:
+        iterations += 1
+        seen = OrderedDict() if max_memory_nodes else None  # node -> cheapest g in this iteration
+        next_threshold = inf
+        if start_id == goal_id:
+            path, cost = [start_id], 0
+            break
+        nodes, costs, on_path = [start_id], [0], {start_id}
+        stack = [iter(view.weighted_neighbors(start_id))]
+        expanded += 1
+
+        while stack:
+            for neighbor, weight in stack[-1]:
+                cost = costs[-1] + weight
+                estimate = cost + heuristics[neighbor]
+                if estimate > threshold:
+                    next_threshold = min(next_threshold, estimate)
+                    continue
+                if neighbor in on_path:
+                    continue
+                if seen is not None:
+                    if seen.get(neighbor, inf) <= cost:
+                        continue
+                    seen[neighbor] = cost
+                    seen.move_to_end(neighbor)
+                    if len(seen) > max_memory_nodes:
+                        seen.popitem(last=False)
+                if neighbor == goal_id:
+                    path = nodes + [goal_id]
+                    stack = []
+                    break
+                nodes.append(neighbor)
+                costs.append(cost)
+                on_path.add(neighbor)
+                stack.append(iter(view.weighted_neighbors(neighbor)))
+                expanded += 1
+                break
+            else:
+                # All branches within the bound tried: backtrack
+                stack.pop()
+                on_path.discard(nodes.pop())
+                costs.pop()
+        threshold = next_threshold
+
+    if stats is not None:
+        stats.update(expanded=expanded, iterations=iterations)
+    if path is None:
+        return None, inf  # If no path found
+    return view.to_names(path), cost
+
+
+# Search tree entry for sma_star
+class _SMANode:
+    __slots__ = ('node', 'parent', 'cost', 'depth', 'f', 'successors', 'children', 'forgotten', 'version')
+
+    def __init__(self, node, parent, cost, depth, f, successors):
+        self.node = node
+        self.parent = parent
+        self.cost = cost
+        self.depth = depth
+        self.f = f
+        self.successors = successors  # Successors not generated yet: [(node, weight)], reversed
+        self.children = {}  # node -> _SMANode kept in memory
+        self.forgotten = {}  # node -> (f, cost) of children dropped to free memory
+        self.version = 0  # Bumped when f or leaf status changes, to invalidate heap entries
+
+    def on_path(self, node):
+        entry = self
+        while entry is not None:
+            if entry.node == node:
+                return True
+            entry = entry.parent
+        return False
+
+
+# SMA* (simplified memory-bounded A*): A* over a search tree that holds at most
+# `max_memory_nodes` entries. The entry with the lowest f (deepest on ties)
+# generates one successor at a time; when memory is full, the leaf with the highest f
+# (shallowest on ties) is forgotten and its f backed up into its parent, which
+# regenerates it only if that branch becomes the most promising again. A
+# successor is skipped if the same node is already in memory at no higher cost.
+# Optimal for an admissible heuristic whenever the optimal path fits in memory
+# (has fewer than `max_memory_nodes` nodes); otherwise the best path that fits,
+# if any, is returned. Returns (path, cost) like a_star; `stats` receives
+# 'expanded' (successors generated), 'forgotten' and 'max_memory'.
+def sma_star(graph, start, goal, heuristics, stats=None, *, max_memory_nodes):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    inf = float('inf')
+    sequence = count()
+
+    def successors(node):
+        return list(view.weighted_neighbors(node))[::-1]
+
+    root = _SMANode(start_id, None, 0, 0, heuristics[start_id], successors(start_id))
+    open_list = []  # (f, -depth, sequence, version, entry): entries with successors left to generate
+    leaves = []  # (-f, depth, sequence, version, entry): candidates to forget
+    copies = {start_id: [root]}  # node -> its entries in memory (one per path reaching it)
+    in_memory = 1
+    expanded = forgotten = 0
+    max_memory = 1
+
+    def queue(entry):
+        entry.version += 1
+        if entry.node == goal_id or entry.successors or entry.forgotten:
+            heapq.heappush(open_list, (entry.f, -entry.depth, next(sequence), entry.version, entry))
+        if not entry.children and entry is not root:
+            heapq.heappush(leaves, (-entry.f, entry.depth, next(sequence), entry.version, entry))
+
+    # Once all of an entry's successors have been generated, its f is the best
+    # of its children's (and forgotten children's); propagate changes upwards
+    def back_up(entry):
+        while entry is not None and not entry.successors:
+            best = min([child.f for child in entry.children.values()] +
+                       [f for f, _ in entry.forgotten.values()], default=inf)
+            if best == entry.f:
+                break
+            entry.f = best
+            queue(entry)
+            entry = entry.parent
+
+    queue(root)
+    while open_list:
+        f, _, _, version, entry = heapq.heappop(open_list)
+        if version != entry.version or entry.depth < 0:
+            continue  # Stale
+        if f == inf:
+            break  # Everything left is a dead end or too deep to fit in memory
+        if entry.node == goal_id:
+            cost = entry.cost
+            path = []
+            while entry is not None:
+                path.append(entry.node)
+                entry = entry.parent
+            if stats is not None:
+                stats.update(expanded=expanded, forgotten=forgotten, max_memory=max_memory)
+            return view.to_names(path[::-1]), cost
+
+        # Generate the next successor: a new one, else the best forgotten one;
+        # cycles and nodes already held in memory more cheaply are skipped
+        node = None
+        while node is None and (entry.successors or entry.forgotten):
+            if entry.successors:
+                node, weight = entry.successors.pop()
+                cost = entry.cost + weight
+                child_f = max(entry.f, cost + heuristics[node])
+            else:
+                node = min(entry.forgotten, key=lambda key: entry.forgotten[key][0])
+                child_f, cost = entry.forgotten.pop(node)
+            if entry.on_path(node) or any(copy.cost <= cost for copy in copies.get(node, ())):
+                node = None
+        if node is None:
+            back_up(entry)
+            continue
+        child = _SMANode(node, entry, cost, entry.depth + 1, child_f, successors(node) if node != goal_id else [])
+        if node != goal_id and (not child.successors or entry.depth + 2 >= max_memory_nodes):
+            child.f = inf  # Dead end, or no room left below it for a path to the goal
+
+        # Make room by forgetting the worst leaf (never the entry being expanded)
+        if in_memory >= max_memory_nodes:
+            put_back = []
+            while leaves:
+                item = heapq.heappop(leaves)
+                leaf = item[4]
+                if item[3] != leaf.version or leaf.depth < 0 or leaf.children:
+                    continue
+                if leaf is entry:
+                    put_back.append(item)
+                    continue
+                parent = leaf.parent
+                del parent.children[leaf.node]
+                copies[leaf.node].remove(leaf)
+                parent.forgotten[leaf.node] = (leaf.f, leaf.cost)
+                leaf.depth = -1  # Marks it (and its heap entries) as dropped
+                in_memory -= 1
+                forgotten += 1
+                back_up(parent)
+                queue(parent)
+                break
+            for item in put_back:
+                heapq.heappush(leaves, item)
+            if in_memory >= max_memory_nodes:
+                heapq.heappush(open_list, (entry.f, -entry.depth, next(sequence), entry.version, entry))
+                break  # Memory too small for even the current path
+
+        entry.children[node] = child
+        copies.setdefault(node, []).append(child)
+        in_memory += 1
+        expanded += 1
+        max_memory = max(max_memory, in_memory)
+        queue(child)
+        back_up(entry)
+        queue(entry)
+
+    if stats is not None:
+        stats.update(expanded=expanded, forgotten=forgotten, max_memory=max_memory)
+    return None, inf  # If no path found
+
+
+# Beam Search algorithm
+def beam_search(graph, start, goal, heuristics, beam_width):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    current_nodes = [(start_id, [start_id])]  # List of tuples (node, path)
+
+    while current_nodes:
+        next_nodes = []
+
+        # Expand each node in the current beam
+        for node, path in current_nodes:
+            if node == goal_id:
+                return view.to_names(path)  # Path found
+
+            neighbors = list(view.neighbors(node))
+            for neighbor in neighbors:
+                if neighbor not in path:  # Prevent cycles
+                    new_path = path + [neighbor]
+                    next_nodes.append((neighbor, new_path))
+
+        # Sort by heuristic value and keep only the top beam_width nodes
+        next_nodes = sorted(next_nodes, key=lambda x: heuristics[x[0]])[:beam_width]
+
+        if not next_nodes:
+            break  # No more nodes to explore
+
+        current_nodes = next_nodes
+
+    return None  # No path found
+
+
+# Hill Climbing algorithm
+def hill_climbing(graph, start, goal, heuristics):
+    view = search_view(graph)
+    current_node, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    path = [current_node]
+
+    while current_node != goal_id:
+        neighbors = list(view.neighbors(current_node))
+
+        if not neighbors:
+            return None  # No path found
+
+        # Choose the neighbor with the best (lowest) heuristic value
+        next_node = min(neighbors, key=lambda n: heuristics[n])
+
+        if heuristics[next_node] >= heuristics[current_node]:
+            break  # Reached a peak (local maxima)
+
+        current_node = next_node
+        path.append(current_node)
+
+    if current_node == goal_id:
+        return view.to_names(path)
+    else:
+        return None
+
+
+# Branch and Bound Greedy algorithm
+def branch_and_bound_greedy(graph, start, goal, heuristics):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    # Priority queue for paths (based on cost + heuristic value)
+    queue = [(0 + heuristics[start_id], 0, start_id, [start_id])]  # (total_cost, actual_cost, current_node, path)
+    best_path = None
+    best_cost = float('inf')  # Bound for best solution
+
+    while queue:
+        # Pop the path with the lowest cost + heuristic
+        total_cost, current_cost, current_node, path = heapq.heappop(queue)
+
+        # If we reached the goal, update the best path
+        if current_node == goal_id:
+            if current_cost < best_cost:
+                best_cost = current_cost
+                best_path = path
+
+        # If the current path exceeds best known cost, prune (bound)
+        if current_cost >= best_cost:
+            continue
+
+        # Explore neighbors (branch)
+        for neighbor, weight in view.weighted_neighbors(current_node):
+            if neighbor not in path:
+                new_cost = current_cost + weight
+                total_estimated_cost = new_cost + heuristics[neighbor]  # Add heuristic to estimate
+                new_path = path + [neighbor]
+                heapq.heappush(queue, (total_estimated_cost, new_cost, neighbor, new_path))
+
+    if best_path is None:
+        return None, None
+    return view.to_names(best_path), best_cost
+
+
+# Branch and Bound Greedy Exit algorithm
+def branch_and_bound_greedy_exit(graph, start, goal, heuristics, exit_bound=float('inf')):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    # Priority queue for paths (based on cost + heuristic value)
+    queue = [(0 + heuristics[start_id], 0, start_id, [start_id])]  # (total_cost, actual_cost, current_node, path)
+    best_path = None
+    best_cost = float('inf')  # Bound for best solution
+
+    while queue:
+        # Pop the path with the lowest cost + heuristic
+        total_cost, current_cost, current_node, path = heapq.heappop(queue)
+
+        # If we reached the goal and found a path better than the exit bound, return immediately
+        if current_node == goal_id and current_cost <= exit_bound:
+            return view.to_names(path), current_cost
+
+        # If current path exceeds best known cost, prune (bound)
+        if current_cost >= best_cost:
+            continue
+
+        # Explore neighbors (branch)
+        for neighbor, weight in view.weighted_neighbors(current_node):
+            if neighbor not in path:
+                new_cost = current_cost + weight
+                total_estimated_cost = new_cost + heuristics[neighbor]  # Add heuristic to estimate
+                new_path = path + [neighbor]
+                heapq.heappush(queue, (total_estimated_cost, new_cost, neighbor, new_path))
+
+    # If no path found within bound, return the best found so far
+    if best_path is None:
+        return None, None
+    return view.to_names(best_path), best_cost
+
+
+# Anytime version of branch_and_bound_greedy (and, with `exit_bound`, of
+# branch_and_bound_greedy_exit): a generator that yields every improved
+# incumbent as (path, cost, elapsed seconds, nodes expanded, lower bound) as soon
+# as it is found. It first dives greedily (lowest heuristic first), so a first
+# incumbent turns up after a single descent, then continues best-first by
+# cost + heuristic. Partial paths are cut when they reach the incumbent's cost
+# or a node already reached more cheaply, so each node is expanded again only
+# when a cheaper path to it turns up.
+#
+# The search stops once `time_budget` seconds or `node_budget` expansions are
+# used up, once an incumbent costs at most `exit_bound` and would be the next
+# goal reached in cost + heuristic order (as in branch_and_bound_greedy_exit,
+# so the greedy dive alone never ends the search), or when no open path is
+# left; a final entry then repeats the best incumbent with the lower bound
+# reached at that point (equal to its cost if the search finished). The lower
+# bound is the smallest cost + heuristic of any open path, so the gap
+# `cost - lower bound` is proven only for an admissible heuristic.
+def branch_and_bound_anytime(graph, start, goal, heuristics, time_budget=None, node_budget=None, exit_bound=None):
+    started = time.perf_counter()
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    deadline = started + time_budget if time_budget is not None else float('inf')
+    inf = float('inf')
+    best_costs = view.node_map(inf)  # Cheapest cost at which each node has been reached
+    expanded_at = view.node_map(inf)  # Cost at which each node was last expanded
+    parents = view.node_map(UNSEEN)
+    best_costs[start_id] = 0
+    parents[start_id] = None
+    queue = [(heuristics[start_id], 0, start_id)]  # Open paths: (cost + heuristic, cost, node)
+    best_path, best_cost = None, inf
+    expanded = 0
+    current = inf  # Cost + heuristic of the node being expanded (its unexpanded branches)
+
+    def incumbent():
+        bound = min(best_cost, current, queue[0][0]) if queue else min(best_cost, current)
+        return best_path, best_cost, time.perf_counter() - started, expanded, bound
+
+    if start_id == goal_id:
+        best_path, best_cost, queue = [start], 0, []
+        yield incumbent()
+        return
+
+    dive = start_id  # Next node of the greedy descent, until the first incumbent
+    while True:
+        if (node_budget is not None and expanded >= node_budget) or time.perf_counter() >= deadline:
+            break
+        if dive is not None:
+            node, cost, dive = dive, best_costs[dive], None
+        else:
+            # Best-first: the open path with the smallest cost + heuristic
+            while queue:
+                estimate, cost, node = heapq.heappop(queue)
+                if cost == best_costs[node] and cost < expanded_at[node] and cost < best_cost:
+                    break
+            else:
+                queue = []
+                break  # No open path left: the incumbent is optimal
+            # Exit once an incumbent within the exit bound is the next goal in cost + heuristic order
+            if exit_bound is not None and best_path is not None and best_cost <= exit_bound and best_cost <= estimate:
+                heapq.heappush(queue, (estimate, cost, node))
+                break
+        expanded_at[node] = cost
+        expanded += 1
+        current = cost + heuristics[node]
+
+        for neighbor, weight in view.weighted_neighbors(node):
+            new_cost = cost + weight
+            # Prune (bound) paths that cannot beat the incumbent or a cheaper path to the same node
+            if new_cost >= best_cost or new_cost >= best_costs[neighbor]:
+                continue
+            best_costs[neighbor] = new_cost
+            parents[neighbor] = node
+
+            # If we reached the goal, the path to it is the new incumbent
+            if neighbor == goal_id:
+                path = reconstruct_path(parents, goal_id)
+                # Ancestors may have been reached more cheaply since, so cost the path as rebuilt
+                best_cost = sum(dict(view.weighted_neighbors(u))[v] for u, v in zip(path, path[1:]))
+                best_path = view.to_names(path)
+                dive = None
+                yield incumbent()
+                continue
+            heapq.heappush(queue, (new_cost + heuristics[neighbor], new_cost, neighbor))
+            if best_path is None and (dive is None or heuristics[neighbor] < heuristics[dive]):
+                dive = neighbor
+        current = inf
+
+    if best_path is not None:
+        yield incumbent()
+
+
+# Branch and Bound with Heuristic algorithm. With `queue` ('indexed' or
+# 'lazy') it keeps one queue entry per node instead of one per partial path,
+# skips entries made stale by a cheaper path, and reports 'settled' and queue
+# counters in `stats`; the result stays optimal.
+def branch_and_bound_heuristic(graph, start, goal, heuristics, queue=None, stats=None):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    if queue is not None:
+        path, cost = best_first_search(view, start_id, goal_id, heuristics, queue, stats, exhaustive=True)
+        return (view.to_names(path), cost) if path else (None, None)
+
+    # Priority queue for paths (based on cost + heuristic value)
+    queue = [(0 + heuristics[start_id], 0, start_id, [start_id])]  # (total_cost, actual_cost, current_node, path)
+    best_path = None
+    best_cost = float('inf')  # Bound for best solution
+
+    while queue:
+        # Pop the path with the lowest cost + heuristic
+        total_cost, current_cost, current_node, path = heapq.heappop(queue)
+
+        # If we reached the goal, update the best path
+        if current_node == goal_id:
+            if current_cost < best_cost:
+                best_cost = current_cost
+                best_path = path
+
+        # If current path exceeds best known cost, prune (bound)
+        if current_cost >= best_cost:
+            continue
+
+        # Explore neighbors (branch)
+        for neighbor, weight in view.weighted_neighbors(current_node):
+            if neighbor not in path:
+                new_cost = current_cost + weight
+                total_estimated_cost = new_cost + heuristics[neighbor]  # Add heuristic to estimate
+                new_path = path + [neighbor]
+                heapq.heappush(queue, (total_estimated_cost, new_cost, neighbor, new_path))
+
+    if best_path is None:
+        return None, None
+    return view.to_names(best_path), best_cost
+
+
+# Branch and Bound with Greedy Heuristics algorithm
+def branch_and_bound_greedy_heuristic(graph, start, goal, heuristics):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    heuristics = heuristic_table(view, heuristics, goal_id)
+    # Priority queue for paths (based on heuristic value)
+    queue = [(heuristics[start_id], start_id, [start_id])]  # (estimated_cost, current_node, path)
+    best_path = None
+    best_cost = float('inf')  # Bound for best solution
+
+    while queue:
+        # Pop the path with the lowest heuristic value
+        heuristic_cost, current_node, path = heapq.heappop(queue)
+
+        # If we reached the goal, update the best path
+        if current_node == goal_id:
+            return view.to_names(path), sum(dict(view.weighted_neighbors(u))[v] for u, v in zip(path, path[1:]))
+
+        # Explore neighbors (branch)
+        for neighbor in view.neighbors(current_node):
+            if neighbor not in path:
+                new_path = path + [neighbor]
+                # Add to the queue with the heuristic of the neighbor
+                heapq.heappush(queue, (heuristics[neighbor], neighbor, new_path))
+
+    if best_path is None:
+        return None, None
+    return view.to_names(best_path), best_cost
@@ -0,0 +1,128 @@
+# ALT (A*, landmarks, triangle inequality) preprocessing. Dijkstra distances
+# from and to K landmarks are computed once per graph and stored as arrays;
+# for any landmark L, d(L, goal) - d(L, v) and d(v, L) - d(goal, L) are lower
+# bounds on d(v, goal), so their maximum is an admissible A* heuristic.
+import heapq
+
+import numpy as np
+
+from aisearch.csr import CSRGraph, name_array
+from aisearch.heuristics import HeuristicProvider
+
+
+# Single-source Dijkstra over a CSRGraph; returns distances by node ID (inf if unreachable)
+def dijkstra_distances(csr, source):
+    indptr, indices, weights = csr._adjacency_lists()
+    distances = [float('inf')] * len(csr)
+    distances[source] = 0.0
+    queue = [(0.0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue  # Stale entry
+        for i in range(indptr[node], indptr[node + 1]):
+            new_distance = distance + weights[i]
+            neighbor = indices[i]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                heapq.heappush(queue, (new_distance, neighbor))
+    return np.array(distances)
+
+
+# Landmark distances with unreachable (infinite) entries replaced by a large
+# finite value, once: inf - inf would give NaN in every estimate, while the
+# stand-in minus itself gives 0 (no information) and minus a real distance
+# stays far above any real path cost
+def _finite(distances):
+    distances = np.asarray(distances)
+    unreachable = np.finfo(distances.dtype).max / 4
+    return np.where(np.isfinite(distances), distances, unreachable).astype(distances.dtype)
+
+
+class Landmarks:
+    def __init__(self, landmarks, from_landmarks, to_landmarks, names):
+        self.landmarks = np.asarray(landmarks, dtype=np.int64)
+        self.from_landmarks = _finite(from_landmarks)  # shape (K, num_nodes): d(L, v)
+        self.to_landmarks = _finite(to_landmarks)  # shape (K, num_nodes): d(v, L)
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+    # Pick `k` landmarks by farthest-point selection (each new landmark is the
+    # node farthest from those chosen so far) and run Dijkstra from each one
+    @classmethod
+    def build(cls, graph, k=8, seed=0, dtype=np.float64):
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+        reverse = csr.reversed()
+        rng = np.random.default_rng(seed)
+        k = min(k, len(csr))
+
+        landmarks = []
+        from_rows, to_rows = [], []
+        nearest = np.full(len(csr), np.inf)
+        candidate = int(rng.integers(len(csr)))
+        for _ in range(k):
+            landmarks.append(candidate)
+            from_rows.append(dijkstra_distances(csr, candidate))
+            to_rows.append(from_rows[-1] if reverse is csr else dijkstra_distances(reverse, candidate))
+            nearest = np.minimum(nearest, from_rows[-1])
+            # Farthest reachable node next; unreachable nodes start a new component
+            reachable = np.isfinite(nearest)
+            if reachable.all():
+                candidate = int(np.argmax(nearest))
+            else:
+                candidate = int(np.flatnonzero(~reachable)[0])
+
+        return cls(landmarks, np.array(from_rows, dtype=dtype), np.array(to_rows, dtype=dtype), csr.names)
+
+    # Save the tables to an .npz file; node names must be str or int
+    def save(self, path):
+        np.savez(path, landmarks=self.landmarks, from_landmarks=self.from_landmarks,
+                 to_landmarks=self.to_landmarks, names=name_array(self.names))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['landmarks'], data['from_landmarks'], data['to_landmarks'], data['names'].tolist())
+
+    # Admissible triangle-inequality heuristic for A*
+    def heuristic(self, max_cached_goals=8):
+        return LandmarkHeuristic(self, max_cached_goals)
+
+
+class LandmarkHeuristic(HeuristicProvider):
+    def __init__(self, landmarks, max_cached_goals=8):
+        super().__init__(max_cached_goals)
+        self.landmarks = landmarks
+
+    # Landmark-table columns for nodes given as CSR IDs or, for other graphs,
+    # names; a range of IDs (the whole table) becomes a slice, so rows are not copied
+    def _columns(self, view, nodes):
+        if hasattr(view, 'names'):
+            if len(view.names) != len(self.landmarks.names):
+                raise ValueError("Landmark tables were built for a different graph")
+            if isinstance(nodes, range) and nodes.step == 1:
+                return slice(nodes.start, nodes.stop)
+            return np.asarray(nodes)
+        ids = self.landmarks.ids
+        return np.array([ids[node] for node in nodes], dtype=np.int64)
+
+    def node_work(self, view):
+        return 2 * len(self.landmarks.landmarks)
+
+    def estimate(self, view, nodes, goal):
+        columns = self._columns(view, nodes)
+        goal_column = self._columns(view, [goal])[0]
+        from_landmarks = self.landmarks.from_landmarks
+        to_landmarks = self.landmarks.to_landmarks
+        # One landmark at a time into reused buffers: the (K, n) temporaries
+        # of a single broadcast cost several times more than the arithmetic
+        bounds = np.zeros(len(nodes), dtype=from_landmarks.dtype)
+        bound = np.empty_like(bounds)
+        for k in range(len(from_landmarks)):
+            np.subtract(from_landmarks[k, goal_column], from_landmarks[k, columns], out=bound)
+            np.maximum(bounds, bound, out=bounds)
+            np.subtract(to_landmarks[k, columns], to_landmarks[k, goal_column], out=bound)
+            np.maximum(bounds, bound, out=bounds)
+        # Bounds from an unreachable stand-in mean the goal cannot be reached
+        bounds[bounds >= np.finfo(bounds.dtype).max / 8] = np.inf
+        return bounds
@@ -0,0 +1,271 @@
+# Drawing helpers for the Streamlit pages: a layout that persists across reruns
+# and grows with the graph, and figures that are redrawn only when the graph or
+# the highlighted path changes. Needs matplotlib, so aisearch does not import it.
+#
+# Graphs past a few hundred nodes are drawn in a large-graph mode: edges are
+# rasterized in one batch, nodes drawn as one marker line, and labels only when
+# few enough nodes are in view (level of detail).
+import io
+import random
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+
+from aisearch.store import Overlay
+
+LARGE_GRAPH_NODES = 200       # More nodes (or 5x as many edges) than this: large-graph mode
+LABEL_LIMIT = 150             # Large-graph mode labels at most this many nodes in view
+PATH_LABEL_LIMIT = 30         # ... and, zoomed out, at most this many highlight path nodes
+SPRING_LAYOUT_NODES = 500     # Larger graphs get a random initial layout
+
+
+# Node positions and the last rendered figure/PNG for one graph, meant to be kept
+# in st.session_state. `version` is the page's graph version, bumped on every edit.
+# `base` is a positions dict shared with other sessions (see SharedGraph.derived);
+# it is read through, and only positions of new nodes are kept per session.
+class GraphLayout:
+    def __init__(self, seed=0, base=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pos = {} if base is None else Overlay(base)
+        self.version = None
+        self._structure = None  # Nodes and edges at the last spring layout
+        self._figure = None
+        self._figure_key = None
+        self._png = None
+        self._png_key = None
+
+    # Positions for `graph` at `version`. New nodes are put next to their
+    # already placed neighbors (or anywhere inside the current extent). A small
+    # graph is then laid out again by a spring layout started from those
+    # positions whenever its nodes or edges change, so it settles into shape
+    # as edges are added while existing nodes move only as far as they must.
+    # Large graphs keep existing nodes in place (a spring layout of tens of
+    # thousands of nodes takes minutes).
+    def positions(self, graph, version):
+        if version == self.version:
+            return self.pos
+        if isinstance(self.pos, Overlay):
+            pos = self.pos
+            for node in [node for node in pos if node not in graph]:
+                del pos[node]
+        else:
+            pos = {node: self.pos[node] for node in graph if node in self.pos}
+        if not pos and len(graph):
+            pos = initial_layout(graph, self.seed)
+            self._structure = (frozenset(graph), frozenset(graph.edges))
+        new = [node for node in graph if node not in pos]
+        if new:
+            if pos:
+                xs = [xy[0] for xy in pos.values()]
+                ys = [xy[1] for xy in pos.values()]
+                box = (min(xs), max(xs), min(ys), max(ys))
+            else:
+                box = (0.0, 0.0, 0.0, 0.0)
+            spacing = max(box[1] - box[0], box[3] - box[2], 1.0) / (len(pos) + 1) ** 0.5
+            for node in new:
+                pos[node] = self._place(graph, node, pos, box, spacing)
+        if not is_large(graph):
+            pos = self._relayout(graph, pos)
+        self.pos, self.version = pos, version
+        return pos
+
+    def _relayout(self, graph, pos):
+        structure = (frozenset(graph), frozenset(graph.edges))
+        if structure == self._structure:
+            return pos
+        self._structure = structure
+        if len(nx.get_node_attributes(graph, 'pos')) == len(graph):
+            return initial_layout(graph)
+        if len(graph) < 2:
+            return pos
+        pos = nx.spring_layout(graph, pos={node: pos[node] for node in graph}, seed=self.seed)
+        return {node: (float(xy[0]), float(xy[1])) for node, xy in pos.items()}
+
+    def _place(self, graph, node, pos, box, spacing):
+        uniform = self.rng.uniform
+        placed = [pos[neighbor] for neighbor in nx.all_neighbors(graph, node) if neighbor in pos]
+        if placed:
+            x = sum(xy[0] for xy in placed) / len(placed)
+            y = sum(xy[1] for xy in placed) / len(placed)
+            return (x + uniform(-spacing, spacing) / 2, y + uniform(-spacing, spacing) / 2)
+        return (uniform(box[0] - spacing, box[1] + spacing), uniform(box[2] - spacing, box[3] + spacing))
+
+    # Figure of `graph` at `version` with `highlight` (a path) drawn on top. The
+    # figure is kept and returned as-is until the version, the path or the
+    # `view` changes; `style` goes to draw_graph() and must only depend on the graph.
+    def figure(self, graph, version, highlight=None, view=None, **style):
+        key = (version, tuple(highlight or ()), view)
+        if key != self._figure_key:
+            if self._figure is not None:
+                plt.close(self._figure)
+            self._figure = draw_graph(graph, self.positions(graph, version), highlight, view=view, **style)
+            self._figure_key = key
+        return self._figure
+
+    # Same as figure(), rasterized server-side to PNG bytes (for st.image). The
+    # figure is closed right away and only the bytes are kept, so reruns neither
+    # redraw nor re-encode anything.
+    def png(self, graph, version, highlight=None, view=None, dpi=100, **style):
+        key = (version, tuple(highlight or ()), view, dpi)
+        if key != self._png_key:
+            figure = draw_graph(graph, self.positions(graph, version), highlight, view=view, dpi=dpi, **style)
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format='png', dpi=dpi)
+            plt.close(figure)
+            self._png = buffer.getvalue()
+            self._png_key = key
+        return self._png
+
+
+# First layout of a graph: the `pos` node attribute when every node has one
+# (geometric and road graphs), a spring layout for small graphs, otherwise
+# random positions (spring_layout takes minutes on tens of thousands of nodes)
+def initial_layout(graph, seed=0):
+    pos = nx.get_node_attributes(graph, 'pos')
+    if len(pos) < len(graph):
+        if len(graph) <= SPRING_LAYOUT_NODES:
+            pos = nx.spring_layout(graph, seed=seed)
+        else:
+            pos = nx.random_layout(graph, seed=seed)
+    return {node: (float(xy[0]), float(xy[1])) for node, xy in pos.items()}
+
+
+# Whether draw_graph() uses the large-graph mode for `graph`
+def is_large(graph):
+    return graph.number_of_nodes() > LARGE_GRAPH_NODES or graph.number_of_edges() > 5 * LARGE_GRAPH_NODES
+
+
+# Draw `graph` at `pos` the way the pages do: named nodes, optional extra node
+# labels (e.g. heuristic values) and edge labels (e.g. weights), and the nodes
+# and edges of the `highlight` path in orange. `view` is an optional
+# (xmin, xmax, ymin, ymax) window to zoom into. Large graphs are drawn by
+# draw_large_graph().
+def draw_graph(graph, pos, highlight=None, node_color='skyblue', labels=None, edge_labels=None, view=None, dpi=100):
+    if is_large(graph):
+        return draw_large_graph(graph, pos, highlight, node_color, labels, edge_labels, view, dpi)
+    fig, ax = plt.subplots(figsize=(8, 6), dpi=dpi)
+    nx.draw(graph, pos, ax=ax, with_labels=True, node_color=node_color, node_size=1500, font_size=16)
+    if highlight:
+        nx.draw_networkx_nodes(graph, pos, nodelist=highlight, node_color='orange', node_size=1500, ax=ax)
+        nx.draw_networkx_edges(graph, pos, edgelist=list(zip(highlight, highlight[1:])), edge_color='orange', width=4, ax=ax)
+        nx.draw_networkx_labels(graph, pos, {node: node for node in highlight}, font_size=16, ax=ax)
+    if labels is not None:
+        nx.draw_networkx_labels(graph, pos, labels, font_size=12, ax=ax)
+    if edge_labels is not None:
+        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax)
+    if view is not None:
+        ax.set_xlim(view[0], view[1])
+        ax.set_ylim(view[2], view[3])
+    return fig
+
+
+# Large-graph mode. Edges are rasterized with NumPy into one image (1-pixel
+# lines, darker where many overlap) instead of being handed to matplotlib one
+# by one, which takes seconds past a few thousand long edges; directed edges
+# get no arrows. Nodes are the markers of a single line, the highlight path is
+# drawn on top. Labels (node names or `labels`, and `edge_labels`) are drawn
+# only when at most LABEL_LIMIT nodes fall inside `view`; zoomed out, only the
+# highlight path keeps its names (just its ends if it is long).
+def draw_large_graph(graph, pos, highlight=None, node_color='skyblue', labels=None, edge_labels=None, view=None,
+                     dpi=100):
+    fig = plt.figure(figsize=(8, 6), dpi=dpi)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    xy = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+
+    if view is None:
+        low, high = xy.min(axis=0), xy.max(axis=0)
+        margin = np.maximum((high - low) * 0.02, 0.05)
+        view = (low[0] - margin[0], high[0] + margin[0], low[1] - margin[1], high[1] + margin[1])
+    inside = (xy[:, 0] >= view[0]) & (xy[:, 0] <= view[1]) & (xy[:, 1] >= view[2]) & (xy[:, 1] <= view[3])
+    shown = int(inside.sum())
+
+    width, height = int(8 * dpi), int(6 * dpi)
+    counts = _rasterize_edges(xy, edges, view, width, height)
+    image = np.zeros((height, width, 4))
+    image[..., :3] = 0.5
+    image[..., 3] = 1.0 - 0.6 ** counts  # Each line adds 40% opacity
+    ax.imshow(image, extent=view, origin='lower', interpolation='nearest', aspect='auto', zorder=1)
+
+    # Marker size shrinks as more nodes share the axes
+    size = float(np.clip(60.0 / max(shown, 1) ** 0.5, 1.0, 16.0))
+    ax.plot(xy[:, 0], xy[:, 1], linestyle='none', marker='o', markersize=size, color=node_color,
+            markeredgewidth=0, zorder=2)
+
+    named = []
+    if highlight:
+        path = np.array([index[node] for node in highlight])
+        ax.plot(xy[path, 0], xy[path, 1], color='orange', linewidth=2.0, marker='o',
+                markersize=max(1.5 * size, 4.0), markeredgewidth=0, zorder=3)
+        named = [i for i in path.tolist() if inside[i]]
+        if len(named) > PATH_LABEL_LIMIT:
+            named = [i for i in (path[0], path[-1]) if inside[i]]
+
+    if shown <= LABEL_LIMIT:
+        named = np.flatnonzero(inside).tolist()
+        if edge_labels is not None:
+            for (u, v), text in edge_labels.items():
+                i, j = index[u], index[v]
+                if inside[i] and inside[j]:
+                    ax.text((xy[i, 0] + xy[j, 0]) / 2, (xy[i, 1] + xy[j, 1]) / 2, str(text),
+                            fontsize=8, ha='center', va='center', clip_on=True, zorder=5)
+    font_size = 12 if len(named) <= PATH_LABEL_LIMIT else 8
+    for i in named:
+        node = nodes[i]
+        text = labels.get(node, node) if labels is not None else node
+        ax.text(xy[i, 0], xy[i, 1], str(text), fontsize=font_size, ha='center', va='center', clip_on=True, zorder=5)
+
+    ax.set_xlim(view[0], view[1])
+    ax.set_ylim(view[2], view[3])
+    return fig
+
+
+# Per-pixel count of the edges (node index pairs into `xy`) crossing a
+# width x height raster of `view`. Each edge is clipped to the view
+# (Liang-Barsky) and sampled once per pixel column or row it crosses; samples are
+# generated in chunks to bound memory.
+def _rasterize_edges(xy, edges, view, width, height, chunk_samples=1 << 21):
+    scale = np.array([width / (view[1] - view[0]), height / (view[3] - view[2])])
+    pixels = (xy - np.array([view[0], view[2]])) * scale
+    start, end = pixels[edges[:, 0]], pixels[edges[:, 1]]
+    delta = end - start
+
+    enter, leave = np.zeros(len(edges)), np.ones(len(edges))
+    keep = np.ones(len(edges), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for axis, size in ((0, width), (1, height)):
+            for p, q in ((-delta[:, axis], start[:, axis]), (delta[:, axis], size - start[:, axis])):
+                ratio = q / p
+                keep &= (p != 0) | (q >= 0)
+                enter = np.where(p < 0, np.maximum(enter, ratio), enter)
+                leave = np.where(p > 0, np.minimum(leave, ratio), leave)
+    keep &= enter <= leave
+    start, delta = start[keep] + enter[keep, None] * delta[keep], delta[keep] * (leave - enter)[keep, None]
+
+    counts = np.zeros(width * height)
+    samples = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+    step = delta / (samples - 1).clip(min=1)[:, None]
+    last = start + step * (samples - 1)[:, None]
+    ends = np.cumsum(samples)
+    bounds = np.searchsorted(ends, np.arange(chunk_samples, ends[-1] if len(ends) else 0, chunk_samples))
+    for chunk in np.split(np.arange(len(samples)), bounds):
+        if not len(chunk):
+            continue
+        # Sample coordinates as one running sum per axis: `step` along an edge,
+        # and a jump from the previous edge's last sample to the next edge's start
+        steps = samples[chunk]
+        first = np.cumsum(steps) - steps
+        cells = np.zeros(steps.sum(), dtype=np.int64)
+        for axis, size, stride in ((0, width, 1), (1, height, width)):
+            increments = np.repeat(step[chunk, axis], steps)
+            increments[first] = start[chunk, axis]
+            increments[first[1:]] -= last[chunk[:-1], axis]
+            coordinates = np.cumsum(increments).astype(np.int64)
+            cells += np.clip(coordinates, 0, size - 1, out=coordinates) * stride
+        counts += np.bincount(cells, minlength=width * height)
+    return counts.reshape(height, width)
@@ -0,0 +1,352 @@
+# Graphs shared by all sessions of one process. A published graph is frozen
+# and stored once; each session works on a copy-on-write overlay of it, which
+# reads through to the shared graph and keeps only what the session changed.
+# The shared graph's node and edge attribute dicts are read-only, so writing
+# to them in place (g[u][v]['weight'] = w) fails instead of reaching every
+# session; the overlay's add_edge() and add_node() change them for one session.
+import threading
+from collections.abc import MutableMapping
+
+import networkx as nx
+
+
+# Attribute dict of a published graph. It is shared by all sessions, so it
+# cannot be changed in place; copies (dict(d), d.copy(), pickling) are plain dicts.
+class ReadOnlyDict(dict):
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Attributes of a shared graph are read-only; set them with add_edge() or add_node()")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+# Mapping that reads through to `base` and keeps its own writes and deletions
+# locally; `base` is never modified. own(key) gives a private copy of a base
+# value (a dict) that can then be changed in place.
+class Overlay(MutableMapping):
+    def __init__(self, base=None):
+        self.base = {} if base is None else base
+        self.local = {}
+        self.deleted = set()  # Base keys removed in this overlay
+        self.extra = 0  # Local keys not in base
+
+    def __getitem__(self, key):
+        try:
+            return self.local[key]
+        except KeyError:
+            if key in self.deleted:
+                raise
+            return self.base[key]
+
+    def __contains__(self, key):
+        return key in self.local or (key not in self.deleted and key in self.base)
+
+    def __setitem__(self, key, value):
+        if key not in self.local and key not in self.base:
+            self.extra += 1
+        self.deleted.discard(key)
+        self.local[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if self.local.pop(key, self) is not self and key not in self.base:
+            self.extra -= 1
+        if key in self.base:
+            self.deleted.add(key)
+
+    def __iter__(self):
+        local, deleted = self.local, self.deleted
+        for key in self.base:
+            if key not in deleted:
+                yield key
+        for key in local:
+            if key not in self.base:
+                yield key
+
+    def __len__(self):
+        return len(self.base) - len(self.deleted) + self.extra
+
+    def own(self, key):
+        try:
+            return self.local[key]
+        except KeyError:
+            value = self.local[key] = dict(self[key])
+            return value
+
+    def clear(self):
+        self.base = {}
+        self.local.clear()
+        self.deleted.clear()
+        self.extra = 0
+
+
+# Mutators shared by OverlayGraph and OverlayDiGraph. They follow networkx's
+# own, but copy a node's adjacency (or attributes, or an edge's data) into the
+# overlay before changing it instead of writing to the shared graph.
+class _OverlayMethods:
+    def _attach(self, base):
+        self.base = base
+        if base is not None:
+            self.graph = {**base.graph, **self.graph}
+        self._node = Overlay(None if base is None else base._node)
+
+    def _changed(self):
+        cache = getattr(self, '__networkx_cache__', None)
+        if cache:
+            cache.clear()
+
+    def _ensure_node(self, node):
+        if node not in self._node:
+            if node is None:
+                raise ValueError("None cannot be a node")
+            self._add_node_entry(node)
+
+    def add_node(self, node_for_adding, **attr):
+        self._ensure_node(node_for_adding)
+        if attr:
+            self._node.own(node_for_adding).update(attr)
+        self._changed()
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        for node in nodes_for_adding:
+            try:
+                new = node not in self._node
+                data = attr
+            except TypeError:
+                node, node_data = node
+                new = node not in self._node
+                data = {**attr, **node_data}
+            if new:
+                self._ensure_node(node)
+            if data:
+                self._node.own(node).update(data)
+        self._changed()
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self._ensure_node(u_of_edge)
+        self._ensure_node(v_of_edge)
+        self._set_edge(u_of_edge, v_of_edge, attr)
+        self._changed()
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        for edge in ebunch_to_add:
+            if len(edge) == 3:
+                u, v, data = edge
+            elif len(edge) == 2:
+                (u, v), data = edge, {}
+            else:
+                raise nx.NetworkXError(f"Edge tuple {edge} must be a 2-tuple or 3-tuple.")
+            self._ensure_node(u)
+            self._ensure_node(v)
+            self._set_edge(u, v, {**attr, **data})
+        self._changed()
+
+    def remove_node(self, n):
+        if n not in self._node:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.")
+        self._remove_node_entry(n)
+        del self._node[n]
+        self._changed()
+
+    def remove_nodes_from(self, nodes):
+        for n in list(nodes):
+            if n in self._node:
+                self._remove_node_entry(n)
+                del self._node[n]
+        self._changed()
+
+    def remove_edge(self, u, v):
+        if u not in self._adj or v not in self._adj[u]:
+            raise nx.NetworkXError(f"The edge {u}-{v} is not in the graph")
+        self._remove_edge_entry(u, v)
+        self._changed()
+
+    def remove_edges_from(self, ebunch):
+        for edge in ebunch:
+            u, v = edge[:2]
+            if u in self._adj and v in self._adj[u]:
+                self._remove_edge_entry(u, v)
+        self._changed()
+
+
+# Copy-on-write view of a shared undirected graph (a plain, empty graph when
+# `base` is None, so networkx can create new instances of the class). Memory
+# grows with the edits: changing a node copies its neighbor dict, changing an
+# edge copies its data dict.
+class OverlayGraph(_OverlayMethods, nx.Graph):
+    def __init__(self, base=None, **attr):
+        super().__init__(**attr)
+        self._attach(base)
+        self._adj = Overlay(None if base is None else base._adj)
+
+    def _add_node_entry(self, node):
+        self._adj[node] = {}
+        self._node[node] = {}
+
+    def _set_edge(self, u, v, attr):
+        data = dict(self._adj[u].get(v, ()))
+        data.update(attr)
+        self._adj.own(u)[v] = data
+        self._adj.own(v)[u] = data
+
+    def _remove_edge_entry(self, u, v):
+        del self._adj.own(u)[v]
+        if u != v:
+            del self._adj.own(v)[u]
+
+    def _remove_node_entry(self, n):
+        for neighbor in list(self._adj[n]):
+            if neighbor != n:
+                del self._adj.own(neighbor)[n]
+        del self._adj[n]
+
+    def clear(self):
+        self._adj.clear()
+        self._node.clear()
+        self.graph.clear()
+        self._changed()
+
+    def clear_edges(self):
+        for node in list(self._adj):
+            self._adj[node] = {}
+        self._changed()
+
+
+# Copy-on-write view of a shared directed graph, see OverlayGraph
+class OverlayDiGraph(_OverlayMethods, nx.DiGraph):
+    def __init__(self, base=None, **attr):
+        super().__init__(**attr)
+        self._attach(base)
+        self._succ = self._adj = Overlay(None if base is None else base._succ)
+        self._pred = Overlay(None if base is None else base._pred)
+
+    def _add_node_entry(self, node):
+        self._succ[node] = {}
+        self._pred[node] = {}
+        self._node[node] = {}
+
+    def _set_edge(self, u, v, attr):
+        data = dict(self._succ[u].get(v, ()))
+        data.update(attr)
+        self._succ.own(u)[v] = data
+        self._pred.own(v)[u] = data
+
+    def _remove_edge_entry(self, u, v):
+        del self._succ.own(u)[v]
+        del self._pred.own(v)[u]
+
+    def _remove_node_entry(self, n):
+        for successor in list(self._succ[n]):
+            if successor != n:
+                del self._pred.own(successor)[n]
+        for predecessor in list(self._pred[n]):
+            if predecessor != n:
+                del self._succ.own(predecessor)[n]
+        del self._succ[n]
+        del self._pred[n]
+
+    def clear(self):
+        self._succ.clear()
+        self._pred.clear()
+        self._node.clear()
+        self.graph.clear()
+        self._changed()
+
+    def clear_edges(self):
+        for node in list(self._succ):
+            self._succ[node] = {}
+            self._pred[node] = {}
+        self._changed()
+
+
+# One published graph: the frozen graph, its per-node values by label (e.g.
+# 'heuristic', 'score') and values derived from it once for all sessions
+class SharedGraph:
+    def __init__(self, graph, values, version):
+        self.graph = graph
+        self.values = values
+        self.version = version
+        self._derived = {}
+        self._building = {}  # key -> lock held while that value is built
+        self._lock = threading.Lock()
+
+    # A new copy-on-write overlay of the graph and, per label in `labels`, an
+    # Overlay of its values, for one session to read and edit
+    def open(self, labels=()):
+        overlay = OverlayDiGraph(self.graph) if self.graph.is_directed() else OverlayGraph(self.graph)
+        return overlay, {label: Overlay(self.values.get(label, {})) for label in labels}
+
+    # `build(graph)`, computed once and shared (e.g. a layout or an index). The
+    # build runs outside the store's lock, so other keys stay available; callers
+    # asking for the same key meanwhile wait for it instead of building it again.
+    def derived(self, key, build):
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            if key not in self._derived:
+                self._derived[key] = build(self.graph)
+                with self._lock:
+                    del self._building[key]
+            return self._derived[key]
+
+
+# Process-wide registry of published graphs, e.g. kept by a Streamlit page in
+# st.cache_resource. Publishing copies the graph once; sessions then open
+# overlays of it, so a graph used by many sessions is held in memory once.
+class GraphStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._graphs = {}
+        self._version = 0
+
+    # Names of the published graphs, only the directed or undirected ones
+    # unless `directed` is None
+    def names(self, directed=None):
+        graphs = self._graphs
+        return sorted(name for name in graphs if directed is None or graphs[name].graph.is_directed() == directed)
+
+    def __contains__(self, name):
+        return name in self._graphs
+
+    def get(self, name):
+        return self._graphs[name]
+
+    # Publish a copy of `graph` (any networkx graph, including an overlay) and
+    # of its per-node `values` ({label: {node: value}}) under `name`. A graph
+    # published earlier under that name is replaced; sessions that opened it keep it.
+    def publish(self, name, graph, values=None):
+        copy = nx.DiGraph(graph) if graph.is_directed() else nx.Graph(graph)
+        _read_only_attributes(copy)
+        values = {label: dict(table) for label, table in (values or {}).items()}
+        with self._lock:
+            self._version += 1
+            self._graphs[name] = SharedGraph(nx.freeze(copy), values, self._version)
+            return self._graphs[name]
+
+    def remove(self, name):
+        with self._lock:
+            self._graphs.pop(name, None)
+
+
+# Replace the node and edge attribute dicts of `graph` by read-only copies. An
+# edge's dict is one object in both endpoints' adjacency (and in _pred), so
+# each replacement is stored in all of them.
+def _read_only_attributes(graph):
+    for node, data in graph._node.items():
+        graph._node[node] = ReadOnlyDict(data)
+    reverse = graph._pred if graph.is_directed() else graph._adj
+    for u, neighbors in graph._adj.items():
+        for v, data in neighbors.items():
+            if type(data) is not ReadOnlyDict:
+                neighbors[v] = reverse[v][u] = ReadOnlyDict(data)
@@ -0,0 +1,414 @@
+# Uninformed search algorithms: they only need the graph (and edge weights)
+import heapq
+from collections import deque
+
+import numpy as np
+
+from aisearch.core import UNSEEN, PathKey, PathTree, best_first_search, reconstruct_path, search_view
+from aisearch.csr import CSRGraph
+from aisearch.heuristics import heuristic_table
+
+
+# BFS algorithm to search the graph (a networkx graph or a CSRGraph)
+def bfs(graph, start, goal):
+    if start == goal:
+        return [start]
+
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    parents = view.node_map(UNSEEN)  # Store each node's predecessor instead of whole paths
+    parents[start_id] = None
+    queue = deque([start_id])
+
+    while queue:
+        node = queue.popleft()
+
+        for neighbor in view.neighbors(node):
+            if parents[neighbor] is UNSEEN:
+                parents[neighbor] = node
+                queue.append(neighbor)
+
+                if neighbor == goal_id:
+                    return view.to_names(reconstruct_path(parents, goal_id))
+
+    return None  # If no path found
+
+
+# Level-synchronous BFS: expands a whole frontier per step with NumPy gathers
+# into the CSR index arrays and a visited bitmap. Returns (distances,
+# predecessors) arrays indexed by node ID, with -1 for unreached nodes (and
+# for the source's predecessor). With a goal, stops after the level that
+# reaches it; nodes beyond that level are left at -1.
+def bfs_levels(graph, source, goal=None):
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+    goal_ids = [csr.id_of(goal)] if goal is not None else None
+    return _bfs_levels(csr, csr.id_of(source), goal_ids)
+
+
+# bfs_levels() on node IDs; stops once every node in `goal_ids` (if given) is reached
+def _bfs_levels(csr, source_id, goal_ids=None):
+    indptr, indices = csr.indptr, csr.indices
+
+    distances = np.full(len(csr), -1, dtype=np.int64)
+    predecessors = np.full(len(csr), -1, dtype=np.int64)
+    visited = np.zeros(len(csr), dtype=bool)
+    visited[source_id] = True
+    distances[source_id] = 0
+
+    frontier = np.array([source_id], dtype=np.int64)
+    level = 0
+    while frontier.size and not (goal_ids is not None and visited[goal_ids].all()):
+        # Gather every edge leaving the frontier
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        neighbors = indices[np.arange(total) + offsets]
+        parents = np.repeat(frontier, counts)
+
+        # Keep unvisited targets, one entry per node (its first discoverer)
+        unvisited = ~visited[neighbors]
+        neighbors, first = np.unique(neighbors[unvisited], return_index=True)
+        parents = parents[unvisited][first]
+
+        level += 1
+        visited[neighbors] = True
+        distances[neighbors] = level
+        predecessors[neighbors] = parents
+        frontier = neighbors
+
+    return distances, predecessors
+
+
+# Rebuild the path to `node` from bfs_levels() results, as node names (None if
+# the node was not reached). `graph` must be the CSRGraph the IDs refer to.
+def levels_path(graph, distances, predecessors, node):
+    node_id = graph.id_of(node)
+    if distances[node_id] == -1:
+        return None
+    path = []
+    while node_id != -1:
+        path.append(node_id)
+        node_id = predecessors[node_id]
+    path.reverse()
+    return graph.to_names(path)
+
+
+# DFS algorithm. Iterative, so path depth is not limited by the recursion limit:
+# `stack` holds one neighbor iterator per node on the current path, and `path`
+# is pushed/popped in step with it. Finds the same path as the recursive form.
+def dfs(graph, start, goal):
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    if start_id == goal_id:
+        return [start]
+
+    visited = view.node_map(False)
+    visited[start_id] = True
+    path = [start_id]
+    stack = [iter(view.neighbors(start_id))]
+
+    while stack:
+        for neighbor in stack[-1]:
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                path.append(neighbor)
+                if neighbor == goal_id:
+                    return view.to_names(path)
+                stack.append(iter(view.neighbors(neighbor)))
+                break
+        else:
+            # All neighbors tried: backtrack
+            stack.pop()
+            path.pop()
+
+    return None
+
+
+# Function for Bidirectional Search (BDS). With weighted=True, runs the exact
+# bidirectional Dijkstra below and returns only its path.
+#
+# By default the two sides alternate, expanding one node each. With `balance`
+# set, each step instead expands a whole BFS level of one side: the side with
+# the smaller frontier ('size') or the smaller total frontier degree
+# ('degree'). The level mode always returns a shortest path. If given, `stats`
+# (a dict) receives the nodes expanded per side under 'forward_explored' and
+# 'backward_explored'.
+def bidirectional_search(graph, start, goal, weighted=False, balance=None, stats=None):
+    if weighted:
+        return bidirectional_dijkstra(graph, start, goal)[0]
+    if balance not in (None, 'size', 'degree'):
+        raise ValueError(f"Unknown balance: {balance}")
+    if stats is None:
+        stats = {}
+    stats['forward_explored'] = stats['backward_explored'] = 0
+    if start == goal:
+        return [start]
+
+    view = search_view(graph)
+    reverse_view = view.reversed()  # Goal side follows edges backwards
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+
+    # Parents to reconstruct path
+    start_parents = view.node_map(UNSEEN)
+    goal_parents = view.node_map(UNSEEN)
+    start_parents[start_id] = None
+    goal_parents[goal_id] = None
+
+    if balance is not None:
+        path = _bidirectional_levels(view, reverse_view, start_id, goal_id, start_parents, goal_parents, balance, stats)
+        return view.to_names(path) if path else None
+
+    # Frontiers for BFS from both directions
+    start_queue = deque([start_id])
+    goal_queue = deque([goal_id])
+
+    while start_queue and goal_queue:
+        # Expand from start side
+        if start_queue:
+            stats['forward_explored'] += 1
+            path = expand(view, start_queue, start_parents, goal_parents)
+            if path:
+                return view.to_names(path)
+
+        # Expand from goal side
+        if goal_queue:
+            stats['backward_explored'] += 1
+            path = expand(reverse_view, goal_queue, goal_parents, start_parents)
+            if path:
+                return view.to_names(path[::-1])
+
+    return None  # If no path found
+
+
+# Helper function for expanding the search frontier
+def expand(view, queue, parents, other_parents):
+    current = queue.popleft()
+
+    for neighbor in view.neighbors(current):
+        if parents[neighbor] is UNSEEN:
+            parents[neighbor] = current
+            queue.append(neighbor)
+
+            if other_parents[neighbor] is not UNSEEN:  # Path found
+                return construct_path(parents, other_parents, neighbor)
+
+    return None
+
+
+# Level-batch loop of bidirectional_search(): expand whole levels, always on the
+# cheaper side. Before the frontiers first meet, every node reached by both
+# sides would already have been a meeting, so each meeting found while
+# expanding a level lies on the other side's current frontier and all of them
+# give the same (shortest) length: the first one can be returned.
+def _bidirectional_levels(view, reverse_view, start_id, goal_id, start_parents, goal_parents, balance, stats):
+    sides = (
+        (view, start_parents, goal_parents, 'forward_explored'),
+        (reverse_view, goal_parents, start_parents, 'backward_explored'),
+    )
+    frontiers = [[start_id], [goal_id]]
+
+    while frontiers[0] and frontiers[1]:
+        if balance == 'size':
+            costs = [len(frontiers[0]), len(frontiers[1])]
+        else:
+            costs = [sum(len(sides[i][0].neighbors(node)) for node in frontiers[i]) for i in (0, 1)]
+        side = 0 if costs[0] <= costs[1] else 1
+        side_view, parents, other_parents, counter = sides[side]
+
+        next_frontier = []
+        for node in frontiers[side]:
+            stats[counter] += 1
+            for neighbor in side_view.neighbors(node):
+                if parents[neighbor] is UNSEEN:
+                    parents[neighbor] = node
+                    next_frontier.append(neighbor)
+                    if other_parents[neighbor] is not UNSEEN:
+                        return construct_path(start_parents, goal_parents, neighbor)
+        frontiers[side] = next_frontier
+
+    return None
+
+
+# Helper function to construct the full path from both sides
+def construct_path(start_parents, goal_parents, meeting_node):
+    # Path from start to meeting node
+    path_start = reconstruct_path(start_parents, meeting_node)
+
+    # Path from meeting node to goal
+    path_goal = reconstruct_path(goal_parents, goal_parents[meeting_node])
+    path_goal.reverse()
+
+    return path_start + path_goal
+
+
+# Bidirectional Dijkstra: a forward search from start and a backward search
+# from goal (over reversed edges), with parent and distance maps that are plain
+# arrays on CSR graphs. mu is the cheapest start -> goal path seen where the two
+# searches touch; once the smallest keys of both queues add up to at least mu,
+# no better path exists. `balance` picks the side to expand: 'cost' (smaller
+# queue key) or 'size' (smaller queue). Returns (path, cost) or (None, inf).
+def bidirectional_dijkstra(graph, start, goal, balance='cost'):
+    if balance not in ('cost', 'size'):
+        raise ValueError(f"Unknown balance: {balance}")
+    view = search_view(graph)
+    views = (view, view.reversed())
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    if start_id == goal_id:
+        return [start], 0
+
+    inf = float('inf')
+    distances = (view.node_map(inf), view.node_map(inf))
+    parents = (view.node_map(UNSEEN), view.node_map(UNSEEN))
+    distances[0][start_id] = distances[1][goal_id] = 0
+    parents[0][start_id] = parents[1][goal_id] = None
+    queues = ([(0, start_id)], [(0, goal_id)])
+    mu, meeting = inf, None
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= mu:
+            break
+        if balance == 'cost':
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        else:
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+
+        distance, node = heapq.heappop(queues[side])
+        if distance > distances[side][node]:
+            continue  # Stale entry
+        side_distances, other_distances = distances[side], distances[1 - side]
+        for neighbor, weight in views[side].weighted_neighbors(node):
+            new_distance = distance + weight
+            if new_distance < side_distances[neighbor]:
+                side_distances[neighbor] = new_distance
+                parents[side][neighbor] = node
+                heapq.heappush(queues[side], (new_distance, neighbor))
+                if new_distance + other_distances[neighbor] < mu:
+                    mu, meeting = new_distance + other_distances[neighbor], neighbor
+
+    if meeting is None:
+        return None, inf
+    return view.to_names(construct_path(parents[0], parents[1], meeting)), mu
+
+
+# Branch and Bound algorithm. With `queue` ('indexed' or 'lazy') it keeps one
+# queue entry per node instead of one per partial path, skips entries made
+# stale by a cheaper path, and reports 'settled' and queue counters in `stats`.
+def branch_and_bound(graph, start, goal, queue=None, stats=None, prune=None):
+    view = search_view(graph)
+    goal_id = view.id_of(goal)
+    if prune == 'dominance':
+        path, cost = _branch_and_bound_dominance(view, view.id_of(start), goal_id, stats)
+        return (view.to_names(path), cost) if path else (None, None)
+    if prune is not None:
+        raise ValueError(f"Unknown pruning mode: {prune}")
+    if queue is not None:
+        path, cost = best_first_search(view, view.id_of(start), goal_id, view.node_map(0), queue, stats, exhaustive=True)
+        return (view.to_names(path), cost) if path else (None, None)
+
+    # Partial paths are entries in a shared search tree; the queue only holds handles
+    tree = PathTree()
+    start_id = view.id_of(start)
+    queue = [(0, start_id, PathKey(tree, tree.add(start_id)))]  # (cost, current_node, tree_key)
+    best_handle = None
+    best_cost = float('inf')  # Bound for best solution
+
+    while queue:
+        # Pop the path with the lowest cost
+        current_cost, current_node, key = heapq.heappop(queue)
+        handle = key.handle
+
+        # If we reached the goal, update the best path
+        if current_node == goal_id:
+            if current_cost < best_cost:
+                best_cost = current_cost
+                tree.retain(handle)
+                if best_handle is not None:
+                    tree.release(best_handle)
+                best_handle = handle
+
+        # Branch only while the path is cheaper than the best known cost (bound)
+        if current_cost < best_cost:
+            # Explore neighbors (branch)
+            for neighbor, weight in view.weighted_neighbors(current_node):
+                if not tree.on_path(handle, neighbor):
+                    heapq.heappush(queue, (current_cost + weight, neighbor, PathKey(tree, tree.add(neighbor, handle))))
+        tree.release(handle)  # Popped: only its queued children (if any) keep it
+
+    best_path = view.to_names(tree.path(best_handle)) if best_handle is not None else None
+    return best_path, best_cost if best_path else None
+
+
+# Branch and bound with dominance pruning. Partial paths are extended cheapest
+# first. Reaching the goal sets the incumbent, and a path is cut as soon as it
+# reaches the incumbent's cost (pruned_bound) or a node no cheaper than the best
+# cost already seen there (pruned_dominance). The search ends when no queued
+# path can beat the incumbent. With non-negative weights each node is expanded
+# at most once. Every node on the current path has been expanded, so cycle
+# checks are an O(1) lookup in the settled set (pruned_cycle counts edges back
+# to settled nodes). Returns (path IDs, cost) or (None, inf); `stats` receives
+# 'expanded' plus the 'pruned_bound', 'pruned_dominance' and 'pruned_cycle'
+# counters.
+def _branch_and_bound_dominance(view, start, goal, stats=None):
+    inf = float('inf')
+    best_costs = view.node_map(inf)  # Cheapest cost at which each node has been reached
+    parents = view.node_map(UNSEEN)
+    settled = view.node_map(False)
+    best_costs[start] = 0
+    parents[start] = None
+    queue = [(0, start)] if start != goal else []
+    best_cost = 0 if start == goal else inf  # Incumbent: cheapest path to the goal so far
+    expanded = pruned_bound = pruned_dominance = pruned_cycle = 0
+
+    while queue:
+        cost, node = heapq.heappop(queue)
+        if cost >= best_cost:
+            break  # No queued path can beat the incumbent
+        if settled[node] or cost > best_costs[node]:
+            continue  # Superseded by a cheaper path to the same node
+        settled[node] = True
+        expanded += 1
+
+        for neighbor, weight in view.weighted_neighbors(node):
+            new_cost = cost + weight
+            if settled[neighbor]:
+                pruned_cycle += 1
+            elif new_cost >= best_cost:
+                pruned_bound += 1
+            elif new_cost >= best_costs[neighbor]:
+                pruned_dominance += 1
+            else:
+                best_costs[neighbor] = new_cost
+                parents[neighbor] = node
+                if neighbor == goal:
+                    best_cost = new_cost  # New incumbent tightens the bound
+                else:
+                    heapq.heappush(queue, (new_cost, neighbor))
+
+    if stats is not None:
+        stats.update(expanded=expanded, pruned_bound=pruned_bound,
+                     pruned_dominance=pruned_dominance, pruned_cycle=pruned_cycle)
+    if best_cost == inf:
+        return None, inf
+    return reconstruct_path(parents, goal), best_cost
+
+
+# Oracle Search (simulated by finding the shortest path). With a
+# ContractionHierarchy `index` built for the current graph `version`, the
+# query is answered from the index; a stale or missing index falls back to
+# Dijkstra. Without an index, an admissible heuristic (e.g.
+# Landmarks.heuristic()) can guide the search while keeping it exact. Works on
+# any graph with the search interface (networkx, CSRGraph, ImplicitGraph).
+def oracle_search(graph, start, goal, heuristics=None, index=None, version=None):
+    if index is not None and not index.is_stale(version):
+        return index.shortest_path(start, goal)
+    # Since the "oracle" knows the exact solution, we run an exact shortest-path search
+    view = search_view(graph)
+    start_id, goal_id = view.id_of(start), view.id_of(goal)
+    table = view.node_map(0) if heuristics is None else heuristic_table(view, heuristics, goal_id)
+    path, _ = best_first_search(view, start_id, goal_id, table)
+    if path is None:
+        return None  # No path exists between the start and goal
+    return view.to_names(path)
@@ -0,0 +1,70 @@
+# ALT landmarks versus zero-heuristic Dijkstra for repeated point-to-point A*
+# queries on one weighted graph. Reports preprocessing time, settled nodes and
+# query latency. Run from the repository root:
+#   python benchmarks/alt_landmarks.py [num_nodes] [num_landmarks] [num_queries]
+import os
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aisearch.csr import CSRGraph
+from aisearch.informed import a_star
+from aisearch.landmarks import Landmarks
+
+
+# Grid with jittered node positions, some edges removed and Euclidean edge
+# weights (a road-network stand-in)
+def random_road_graph(num_nodes, seed=0):
+    rng = random.Random(seed)
+    side = int(num_nodes ** 0.5)
+    graph = nx.grid_2d_graph(side, side)
+    graph.remove_edges_from([edge for edge in list(graph.edges) if rng.random() < 0.2])
+    graph = graph.subgraph(max(nx.connected_components(graph), key=len)).copy()
+    pos = {node: (node[0] + rng.uniform(-0.3, 0.3), node[1] + rng.uniform(-0.3, 0.3)) for node in graph}
+    for u, v in graph.edges:
+        (x1, y1), (x2, y2) = pos[u], pos[v]
+        graph[u][v]['weight'] = ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+    return graph
+
+
+def run_queries(csr, pairs, heuristics):
+    settled, latencies = [], []
+    for start, goal in pairs:
+        stats = {}
+        begin = time.perf_counter()
+        _, cost = a_star(csr, start, goal, heuristics, stats)
+        latencies.append(time.perf_counter() - begin)
+        settled.append(stats['settled'])
+    return np.array(settled), np.array(latencies) * 1000
+
+
+if __name__ == '__main__':
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    num_landmarks = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    num_queries = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    # Saved landmark tables need str or int node names
+    graph = nx.relabel_nodes(random_road_graph(num_nodes), lambda node: f'{node[0]},{node[1]}')
+    csr = CSRGraph.from_networkx(graph)
+    rng = random.Random(1)
+    pairs = [tuple(rng.sample(csr.names, 2)) for _ in range(num_queries)]
+    print(f"{len(csr)} nodes, {csr.number_of_edges()} edges, {num_queries} queries")
+
+    begin = time.perf_counter()
+    landmarks = Landmarks.build(csr, num_landmarks)
+    elapsed = time.perf_counter() - begin
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'alt_landmarks.npz')
+        landmarks.save(path)
+        print(f"preprocessing: {num_landmarks} landmarks in {elapsed:.2f}s, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB on disk")
+
+    for name, heuristics in (('dijkstra', [0.0] * len(csr)), ('alt', landmarks.heuristic())):
+        settled, latencies = run_queries(csr, pairs, heuristics)
+        print(f"{name:<9} settled mean={settled.mean():9.0f}  "
+              f"latency mean={latencies.mean():7.2f}ms p50={np.median(latencies):7.2f}ms p95={np.percentile(latencies, 95):7.2f}ms")
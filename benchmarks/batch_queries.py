@@ -0,0 +1,44 @@
+# Batched queries versus one search per pair: a batch of point-to-point
+# queries drawn from a limited set of sources, answered per pair with Dijkstra
+# (a_star with a zero heuristic) and in one call to batch_shortest_paths.
+# Run from the repository root:
+#   python benchmarks/batch_queries.py [num_nodes] [num_queries] [num_sources]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aisearch.batch import batch_shortest_paths
+from aisearch.csr import CSRGraph
+from aisearch.informed import a_star
+from alt_landmarks import random_road_graph
+
+if __name__ == '__main__':
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    num_sources = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    csr = CSRGraph.from_networkx(random_road_graph(num_nodes))
+    rng = np.random.default_rng(1)
+    sources = rng.choice(rng.choice(len(csr), num_sources, replace=False), num_queries)
+    targets = rng.integers(0, len(csr), num_queries)
+    print(f"{len(csr)} nodes, {csr.number_of_edges()} edges, {num_queries} queries from {num_sources} sources")
+
+    # Per pair: time a sample and extrapolate to the whole batch
+    sample = min(num_queries, 200)
+    zeros = [0.0] * len(csr)
+    begin = time.perf_counter()
+    expected = [a_star(csr, csr.name_of(s), csr.name_of(t), zeros)[1] for s, t in zip(sources[:sample].tolist(), targets[:sample].tolist())]
+    per_pair = (time.perf_counter() - begin) / sample
+    print(f"per pair : {per_pair * 1000:7.2f}ms/query, {per_pair * num_queries:8.2f}s for the batch (extrapolated)")
+
+    for weighted in (True, False):
+        begin = time.perf_counter()
+        costs = batch_shortest_paths(csr, sources, targets, weighted=weighted)
+        elapsed = time.perf_counter() - begin
+        print(f"batch    : {elapsed / num_queries * 1000:7.2f}ms/query, {elapsed:8.2f}s for the batch "
+              f"({'weighted' if weighted else 'hop counts'})")
+        if weighted:
+            assert np.allclose(costs[:sample], expected)
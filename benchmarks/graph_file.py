@@ -0,0 +1,43 @@
+# Rebuilding a CSRGraph from networkx versus loading it from the binary graph
+# file (memory-mapped, nothing copied). Reports build, save and load times and
+# the latency of the first query on the loaded graph. The file goes to a
+# temporary directory unless a path is given. Run from the repository root:
+#   python benchmarks/graph_file.py [num_nodes] [path]
+import os
+import sys
+import tempfile
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aisearch.csr import CSRGraph
+from aisearch.informed import a_star
+from alt_landmarks import random_road_graph
+
+if __name__ == '__main__':
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    directory = tempfile.TemporaryDirectory()
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(directory.name, 'graph.bin')
+
+    graph = nx.relabel_nodes(random_road_graph(num_nodes), lambda node: f'{node[0]},{node[1]}')
+    start, goal = min(graph), max(graph)
+    begin = time.perf_counter()
+    csr = CSRGraph.from_networkx(graph)
+    print(f"{len(csr)} nodes, {csr.number_of_edges()} edges")
+    print(f"from_networkx : {time.perf_counter() - begin:8.3f}s")
+
+    begin = time.perf_counter()
+    csr.save(path, node_data={'heuristic': [0.0] * len(csr)})
+    print(f"save          : {time.perf_counter() - begin:8.3f}s ({os.path.getsize(path) / 2 ** 20:.0f} MB)")
+
+    begin = time.perf_counter()
+    loaded = CSRGraph.load(path)
+    print(f"load          : {time.perf_counter() - begin:8.3f}s")
+
+    begin = time.perf_counter()
+    _, cost = a_star(loaded, start, goal, loaded.node_data['heuristic'])
+    print(f"first query   : {time.perf_counter() - begin:8.3f}s")
+    assert abs(cost - a_star(csr, start, goal, [0.0] * len(csr))[1]) < 1e-9
+    del loaded
+    directory.cleanup()
@@ -0,0 +1,54 @@
+# Scaling of parallel_alpha_beta() over 1-16 worker processes on a random game
+# tree with a wide root. Run from the repository root:
+#   python benchmarks/parallel_alpha_beta.py [depth] [root_width]
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aisearch.adversarial import alpha_beta, parallel_alpha_beta
+
+
+# Random game tree: `root_width` moves at the root, 2-5 moves below it
+def random_game_tree(depth, root_width, seed=0):
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    scores = {}
+    counter = 0
+    frontier = ['root']
+    for level in range(depth):
+        next_frontier = []
+        for node in frontier:
+            for _ in range(root_width if level == 0 else rng.randint(2, 5)):
+                counter += 1
+                child = f"n{counter}"
+                graph.add_edge(node, child)
+                next_frontier.append(child)
+        frontier = next_frontier
+    for node in frontier:
+        scores[node] = rng.randint(-100, 100)
+    return graph, scores
+
+
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    root_width = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    graph, scores = random_game_tree(depth, root_width)
+    print(f"{graph.number_of_nodes()} nodes, {os.cpu_count()} CPUs")
+
+    stats = {}
+    start = time.perf_counter()
+    value = alpha_beta(graph, 'root', float('-inf'), float('inf'), True, scores, stats=stats)
+    serial = time.perf_counter() - start
+    print(f"serial      value={value} nodes={stats['nodes']:>9} time={serial:.2f}s")
+
+    for workers in (1, 2, 4, 8, 16):
+        stats = {}
+        start = time.perf_counter()
+        result = parallel_alpha_beta(graph, 'root', scores, workers=workers, stats=stats)
+        elapsed = time.perf_counter() - start
+        assert result == value
+        print(f"workers={workers:<3} value={result} nodes={stats['nodes']:>9} time={elapsed:.2f}s speedup={serial / elapsed:.2f}x")
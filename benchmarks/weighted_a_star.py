@@ -0,0 +1,49 @@
+# Bounded-suboptimal A*: expansions, latency and cost ratio as epsilon grows,
+# for weighted A* (inflated heuristic) and focal search. Uses the ALT landmark
+# heuristic on a road-like graph. Run from the repository root:
+#   python benchmarks/weighted_a_star.py [num_nodes] [num_queries]
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aisearch.csr import CSRGraph
+from aisearch.informed import a_star
+from aisearch.landmarks import Landmarks
+from alt_landmarks import random_road_graph
+
+EPSILONS = (0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0)
+
+
+def run_queries(csr, pairs, heuristics, optimal, epsilon, focal):
+    settled, latencies, ratios = [], [], []
+    for (start, goal), best in zip(pairs, optimal):
+        stats = {}
+        begin = time.perf_counter()
+        _, cost = a_star(csr, start, goal, heuristics, stats, epsilon=epsilon, focal=focal)
+        latencies.append(time.perf_counter() - begin)
+        settled.append(stats['settled'])
+        ratios.append(cost / best if best else 1.0)
+    return np.array(settled), np.array(latencies) * 1000, np.array(ratios)
+
+
+if __name__ == '__main__':
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    csr = CSRGraph.from_networkx(random_road_graph(num_nodes))
+    rng = random.Random(1)
+    pairs = [tuple(rng.sample(csr.names, 2)) for _ in range(num_queries)]
+    heuristics = Landmarks.build(csr, 8).heuristic()
+    optimal = [a_star(csr, start, goal, heuristics)[1] for start, goal in pairs]
+    print(f"{len(csr)} nodes, {csr.number_of_edges()} edges, {num_queries} queries, ALT heuristic")
+
+    for mode, focal in (('weighted', False), ('focal', True)):
+        for epsilon in EPSILONS:
+            settled, latencies, ratios = run_queries(csr, pairs, heuristics, optimal, epsilon, focal)
+            print(f"{mode:<8} eps={epsilon:<5} settled mean={settled.mean():8.0f}  "
+                  f"latency mean={latencies.mean():7.2f}ms p95={np.percentile(latencies, 95):7.2f}ms  "
+                  f"cost/optimal mean={ratios.mean():.4f} max={ratios.max():.4f}")
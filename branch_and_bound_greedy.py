@@ -1,12 +1,21 @@
 import streamlit as st
 import networkx as nx
-import matplotlib.pyplot as plt
-import heapq
+from aisearch.informed import branch_and_bound_anytime, branch_and_bound_greedy
+from aisearch.render import GraphLayout
+from shared_graphs import graph_store, open_shared, publish_graph
 
 # Initialize graph in session state
 if 'graph' not in st.session_state:
     st.session_state.graph = nx.Graph()
 
+# Graph version (bumped on every edit), the layout drawn for it and the path to highlight
+if 'graph_version' not in st.session_state:
+    st.session_state.graph_version = 0
+if 'layout' not in st.session_state:
+    st.session_state.layout = GraphLayout()
+if 'highlight' not in st.session_state:
+    st.session_state.highlight = None
+
 # Initialize heuristic values in session state (used for Greedy selection)
 if 'heuristics' not in st.session_state:
     st.session_state.heuristics = {}
@@ -15,42 +24,12 @@ if 'heuristics' not in st.session_state:
 def add_node(node, heuristic_value):
     st.session_state.graph.add_node(node)
     st.session_state.heuristics[node] = heuristic_value
+    st.session_state.graph_version += 1
 
 # Function to add edge between two nodes with weight
 def add_edge(node1, node2, weight):
     st.session_state.graph.add_edge(node1, node2, weight=weight)
-
-# Branch and Bound Greedy algorithm
-def branch_and_bound_greedy(graph, start, goal):
-    # Priority queue for paths (based on cost + heuristic value)
-    queue = [(0 + st.session_state.heuristics[start], 0, start, [start])]  # (total_cost, actual_cost, current_node, path)
-    visited = set()
-    best_path = None
-    best_cost = float('inf')  # Bound for best solution
-
-    while queue:
-        # Pop the path with the lowest cost + heuristic
-        total_cost, current_cost, current_node, path = heapq.heappop(queue)
-
-        # If we reached the goal, update the best path
-        if current_node == goal:
-            if current_cost < best_cost:
-                best_cost = current_cost
-                best_path = path
-
-        # If the current path exceeds best known cost, prune (bound)
-        if current_cost >= best_cost:
-            continue
-
-        # Explore neighbors (branch)
-        for neighbor in graph.neighbors(current_node):
-            if neighbor not in path:
-                new_cost = current_cost + graph[current_node][neighbor]['weight']
-                total_estimated_cost = new_cost + st.session_state.heuristics[neighbor]  # Add heuristic to estimate
-                new_path = path + [neighbor]
-                heapq.heappush(queue, (total_estimated_cost, new_cost, neighbor, new_path))
-
-    return best_path, best_cost if best_path else None
+    st.session_state.graph_version += 1
 
 # Streamlit UI
 st.title("Branch and Bound Greedy Search Visualization")
@@ -73,16 +52,36 @@ if st.button("Add Edge"):
     if node1 and node2:
         add_edge(node1, node2, weight)
 
+# Share graphs with other sessions
+st.subheader("Shared Graphs")
+shared_name = st.text_input("Publish this graph as:")
+if st.button("Publish"):
+    if shared_name:
+        publish_graph(shared_name, {'heuristic': 'heuristics'})
+shared_graph = st.selectbox("Published graphs", graph_store().names(directed=False))
+if st.button("Open"):
+    if shared_graph:
+        open_shared(shared_graph, {'heuristic': 'heuristics'})
+
 # Select source and destination for Branch and Bound Greedy search
 st.subheader("Branch and Bound Greedy Search")
 start_node = st.selectbox("Select start node", st.session_state.graph.nodes)
 goal_node = st.selectbox("Select destination node", st.session_state.graph.nodes)
+time_budget = st.number_input("Time budget in ms (0 for no limit, reports every improved path):", min_value=0.0, value=0.0)
 
 # Button to start Branch and Bound Greedy search
 if st.button("Start Branch and Bound Greedy Search"):
     if start_node and goal_node:
-        path, cost = branch_and_bound_greedy(st.session_state.graph, start_node, goal_node)
-        if path:
+        if time_budget:
+            path, cost = None, None
+            for path, cost, elapsed, expanded, lower_bound in branch_and_bound_anytime(st.session_state.graph, start_node, goal_node, st.session_state.heuristics, time_budget / 1000):
+                st.write(f"{elapsed * 1000:.1f} ms, {expanded} nodes expanded: cost {cost} (lower bound {lower_bound})")
+        else:
+            path, cost = branch_and_bound_greedy(st.session_state.graph, start_node, goal_node, st.session_state.heuristics)
+        st.session_state.highlight = path
+        if path and time_budget and cost > lower_bound:
+            st.write(f"Best path within budget: {' -> '.join(path)} with cost: {cost}")
+        elif path:
             st.write(f"Optimal Path found: {' -> '.join(path)} with cost: {cost}")
         else:
             st.write("No path found!")
@@ -91,18 +90,11 @@ if st.button("Start Branch and Bound Greedy Search"):
 st.subheader("Graph Visualization")
 
 def draw_graph():
-    pos = nx.spring_layout(st.session_state.graph)
-    plt.figure(figsize=(8, 6))
-    nx.draw(st.session_state.graph, pos, with_labels=True, node_color='skyblue', node_size=1500, font_size=16)
-    
-    # Add heuristic values as node labels
-    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in st.session_state.graph.nodes}
-    nx.draw_networkx_labels(st.session_state.graph, pos, labels, font_size=12)
-
-    # Draw edge weights
-    edge_labels = nx.get_edge_attributes(st.session_state.graph, 'weight')
-    nx.draw_networkx_edge_labels(st.session_state.graph, pos, edge_labels=edge_labels)
-    
-    st.pyplot(plt)
+    graph = st.session_state.graph
+    labels = {node: f"{node}\n(H={st.session_state.heuristics[node]})" for node in graph.nodes}
+    edge_labels = nx.get_edge_attributes(graph, 'weight')
+    image = st.session_state.layout.png(graph, st.session_state.graph_version, st.session_state.highlight,
+                                        node_color='skyblue', labels=labels, edge_labels=edge_labels)
+    st.image(image)
 
 draw_graph()
@@ -0,0 +1,36 @@
+# Graph sharing for the pages: one GraphStore per server process, and the
+# session-state updates for publishing the page's graph or opening a published one
+import streamlit as st
+
+from aisearch.render import GraphLayout, initial_layout
+from aisearch.store import GraphStore
+
+
+# Graphs published from any session, held once by this server process
+@st.cache_resource
+def graph_store():
+    return GraphStore()
+
+
+# Open a published graph: edits go to a copy-on-write overlay, so the session
+# only holds what it changes, and the layout is shared too. `values` maps each
+# label of per-node values (e.g. 'heuristic') to the session-state key of the
+# page's table (e.g. 'heuristics'). Returns the SharedGraph.
+def open_shared(name, values=None):
+    values = values or {}
+    shared = graph_store().get(name)
+    st.session_state.graph, tables = shared.open(list(values))
+    for label, key in values.items():
+        st.session_state[key] = tables[label]
+    st.session_state.layout = GraphLayout(base=shared.derived('positions', initial_layout))
+    if 'highlight' in st.session_state:
+        st.session_state.highlight = None
+    st.session_state.graph_version += 1
+    return shared
+
+
+# Publish the session's graph for other sessions, with the per-node values in
+# `values` (label -> session-state key, as for open_shared)
+def publish_graph(name, values=None):
+    tables = {label: st.session_state[key] for label, key in (values or {}).items()}
+    graph_store().publish(name, st.session_state.graph, tables)
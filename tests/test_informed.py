@@ -0,0 +1,34 @@
+import random
+
+import networkx as nx
+
+from aisearch.informed import branch_and_bound_anytime
+
+
+def page_graph():
+    graph = nx.Graph()
+    graph.add_weighted_edges_from([('A', 'B', 2), ('A', 'C', 1), ('B', 'D', 1), ('C', 'D', 1)])
+    return graph, {'A': 1, 'B': 1, 'C': 1, 'D': 0}
+
+
+# An infinite exit bound must not stop the search before it has an incumbent
+def test_anytime_infinite_exit_bound():
+    graph, heuristics = page_graph()
+    results = list(branch_and_bound_anytime(graph, 'A', 'D', heuristics, 0.5, exit_bound=float('inf')))
+    assert results
+    path, cost, elapsed, expanded, lower_bound = results[-1]
+    assert path == ['A', 'C', 'D'] and cost == 2
+
+
+# A finite exit bound is only tested in the best-first phase, not against the greedy dive
+def test_anytime_exit_bound_skips_greedy_incumbent():
+    rng = random.Random(1)
+    graph = nx.grid_2d_graph(30, 30)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.choice([1, 1, 1, 20])
+    goal = (29, 29)
+    heuristics = {node: abs(goal[0] - node[0]) + abs(goal[1] - node[1]) for node in graph}
+    optimum = nx.dijkstra_path_length(graph, (0, 0), goal)
+    results = list(branch_and_bound_anytime(graph, (0, 0), goal, heuristics, exit_bound=10 ** 6))
+    assert results[0][1] > optimum
+    assert results[-1][1] == optimum